@@ -1,4 +1,12 @@
 # init for api_clients folder containing database_client.py, raster_handler.py, and storage_handler.py
 from .database_client import DatabaseClient
-from .raster_handler import RasterHandler
 from .storage_handler import StorageHandler
+
+
+def __getattr__(name):
+    # RasterHandler pulls in rasterio and rio_cogeo, so it is imported on first use
+    if name == "RasterHandler":
+        from .raster_handler import RasterHandler
+        globals()[name] = RasterHandler
+        return RasterHandler
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,14 +1,18 @@
 from azure.core.exceptions import ResourceNotFoundError
+from contextlib import contextmanager
 import datetime
 from dateutil import parser
+import hashlib
+import os
 import re
 import time
+from weakref import WeakKeyDictionary
 
-from pandas.api.types import (
-    is_float_dtype as is_numpy_float,
-    is_integer_dtype as is_numpy_int)
+from numpy import floating as numpy_float
+from numpy import integer as numpy_int
 import psycopg2
 from psycopg2 import sql
+from psycopg2.pool import PoolError, ThreadedConnectionPool
 from shapely.geometry.base import BaseGeometry
 
 from authorization import VaultAuth
@@ -16,6 +20,8 @@ from utils import (
     DATABASE_ALLOWED_CHARACTERS,
     DATABASE_RESERVED_WORDS,
     DatabaseClientError,
+    DB_CREDENTIAL_CACHE_SECONDS,
+    DB_POOL_MAX_CONNECTIONS,
     DEFAULT_DB_PORT,
     DEFAULT_DB_USER,
     DEFAULT_EPSG_CODE,
@@ -30,8 +36,18 @@ from utils import (
     logger,
 )
 
+# type tuples for per-value isinstance checks in to_insert_value_type
+NATIVE_INSERT_TYPES = (int, float, bool, str)
+DATETIME_INSERT_TYPES = (datetime.datetime, datetime.date, datetime.time, time.struct_time)
+
 class DatabaseClient:
 
+    # connection pools keyed by process, connection parameters and credential fingerprint, shared across instances
+    _pools = dict()
+    # vault secrets by (vault_name, secret_name) with fetch time, refetched after DB_CREDENTIAL_CACHE_SECONDS
+    _vault_secrets = dict()
+    # names of the statements PREPAREd on each pooled connection
+    _prepared_connections = WeakKeyDictionary()
 
     def __init__(
         self,
@@ -48,6 +64,7 @@ class DatabaseClient:
         self.db_user = db_user if db_user else DEFAULT_DB_USER
         self.db_credential = db_credential  #'PGKoMd8-L]abcd'
         self.db_port = db_port if db_port else DEFAULT_DB_PORT
+        self.prepared_statements = dict()
 
         if self.db_credential:
             if not self.db_host:
@@ -80,10 +97,50 @@ class DatabaseClient:
         logger.debug("Database client closed")
 
     # Core Database Methods
-    def connect(self):
-        if not self.db_credential:
-            raise DatabaseClientError("Database credential not initialized")
-        try: 
+    def credential_fingerprint(self) -> str:
+        # short hash of the credential so caches keyed on it never hold the secret itself
+        return hashlib.blake2b(str(self.db_credential).encode(), digest_size=8).hexdigest()
+
+    def connection_pool(self) -> ThreadedConnectionPool:
+        # pid is part of the key so forked workers never share sockets with the parent
+        # the credential fingerprint is part of the key so a rotated credential gets a new pool
+        params = (os.getpid(), self.db_host, self.db_port, self.db_name, self.db_user)
+        key = params + (self.credential_fingerprint(),)
+        pool = DatabaseClient._pools.get(key)
+        if pool is None or pool.closed:
+            for stale_key in [k for k in DatabaseClient._pools if k[:-1] == params and k != key]:
+                logger.debug(f"Closing connection pool for replaced credential {self.db_user}@{self.db_host}/{self.db_name}")
+                stale_pool = DatabaseClient._pools.pop(stale_key)
+                if not stale_pool.closed:
+                    stale_pool.closeall()
+            logger.debug(f"Creating connection pool for {self.db_user}@{self.db_host}/{self.db_name}")
+            pool = ThreadedConnectionPool(
+                minconn=0,
+                maxconn=DB_POOL_MAX_CONNECTIONS,
+                dbname=self.db_name,
+                user=self.db_user,
+                host=self.db_host,
+                port=self.db_port,
+                password=self.db_credential,
+            )
+            DatabaseClient._pools[key] = pool
+            
+        return pool
+
+    def _acquire_connection(self):
+        # returns (connection, pool) - pool is None for a direct connection opened because
+        # the pool was exhausted, ThreadedConnectionPool raises rather than waiting for one
+        pool = self.connection_pool()
+        try:
+            conn = pool.getconn()
+            if conn.closed:
+                pool.putconn(conn, close=True)
+                conn = pool.getconn()
+            return conn, pool
+        except PoolError as e:
+            if pool.closed:
+                raise
+            logger.warning(f"Connection pool exhausted, opening a direct connection: {e}")
             conn = psycopg2.connect(
                 dbname=self.db_name,
                 user=self.db_user,
@@ -91,13 +148,105 @@ class DatabaseClient:
                 port=self.db_port,
                 password=self.db_credential,
             )
-            return conn
+            return conn, None
+
+    def _release_connection(self, conn, pool):
+        # returns a pooled connection, closes a direct one
+        if pool is None:
+            conn.close()
+        else:
+            pool.putconn(conn, close=bool(conn.closed))
+
+    @contextmanager
+    def connect(self):
+        # yields a pooled connection - committed on success, rolled back on error, then returned to the pool
+        if not self.db_credential:
+            raise DatabaseClientError("Database credential not initialized")
+        try:
+            conn, pool = self._acquire_connection()
         except psycopg2.Error as e:
             logger.error(f"psycopg2 error connecting to database: {e}")
             raise
         except Exception as e:
             logger.error(f"Unknown error connecting to database: {e}")
             raise
+        
+        try:
+            if self.prepared_statements:
+                self.prepare_statements(conn)
+            with conn:
+                yield conn
+        finally:
+            self._release_connection(conn, pool)
+
+    @contextmanager
+    def autocommit_connection(self):
+        # yields a pooled connection in autocommit outside any transaction block,
+        # for statements such as CREATE INDEX CONCURRENTLY that cannot run inside one
+        if not self.db_credential:
+            raise DatabaseClientError("Database credential not initialized")
+        conn, pool = self._acquire_connection()
+        try:
+            conn.autocommit = True
+            yield conn
+        finally:
+            if not conn.closed:
+                conn.autocommit = False
+            self._release_connection(conn, pool)
+
+    def register_prepared_statement(self, name: str, statement):
+        # statement uses %s placeholders, it is PREPAREd on each connection this client hands out
+        self.prepared_statements[name] = statement
+
+    def prepare_statements(self, conn):
+        # PREPARE the registered statements not yet prepared on this connection
+        prepared = DatabaseClient._prepared_connections.setdefault(conn, set())
+        for name, statement in self.prepared_statements.items():
+            if name in prepared:
+                continue
+            if isinstance(statement, sql.Composable):
+                statement = statement.as_string(conn)
+            param_numbers = iter(range(1, statement.count("%s") + 1))
+            statement = re.sub("%s", lambda m: f"${next(param_numbers)}", statement)
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        sql.SQL("PREPARE {} AS ").format(sql.Identifier(name)).as_string(conn)
+                        + statement
+                    )
+                conn.commit()
+                prepared.add(name)
+                logger.debug(f"Prepared statement {name}")
+            except psycopg2.Error as e:
+                conn.rollback()
+                logger.warning(f"Could not prepare statement {name}, executing it unprepared: {e}")
+
+    def execute_prepared(self, cursor, name: str, param_list: list):
+        # EXECUTE the prepared statement when this connection has it, otherwise run the statement itself
+        if name in DatabaseClient._prepared_connections.get(cursor.connection, ()):
+            cursor.execute(
+                sql.SQL("EXECUTE {} ({})").format(
+                    sql.Identifier(name),
+                    sql.SQL(", ").join(sql.Placeholder() * len(param_list)),
+                ),
+                param_list,
+            )
+        else:
+            cursor.execute(self.prepared_statements[name], param_list)
+
+    def query_prepared(self, name: str, param_list: list):
+        # query() for registered prepared statements - rows for statements that return them, else True
+        with self.connect() as conn:
+            try:
+                with conn.cursor() as cursor:
+                    self.execute_prepared(cursor, name, param_list)
+                    if cursor.description is not None:
+                        return cursor.fetchall()
+                    conn.commit()
+                    return True
+            except psycopg2.Error as e:
+                logger.error(f"psycopg2 Error executing prepared statement {name}: {e}")
+                raise
     
     def test_connection(self):
         # Test the database connection and raise an exception if it fails
@@ -667,11 +816,11 @@ class DatabaseClient:
     def to_insert_value_type(self, obj) -> object:
         #fast convert
         
-        if isinstance(obj,(int, float, bool, str)):
+        if isinstance(obj, NATIVE_INSERT_TYPES):
             
             return obj
         # Float
-        elif is_numpy_float(obj):
+        elif isinstance(obj, numpy_float):
             try:
                 obj = float(obj)
                 
@@ -680,7 +829,7 @@ class DatabaseClient:
                 logger.error(f"Error converting numpy float to float: {e}")
                 return None
         # Integer
-        elif is_numpy_int(obj):
+        elif isinstance(obj, numpy_int):
             try:
                 obj = int(obj)
                 
@@ -700,7 +849,7 @@ class DatabaseClient:
                 logger.error(f"Error converting geometry <{obj}> to WKT: {e}")
                 return None
         # Timestamp
-        elif isinstance(obj, (datetime.datetime, datetime.date, datetime.time, time.struct_time)):
+        elif isinstance(obj, DATETIME_INSERT_TYPES):
             try:
                 obj = parser.parse(str(obj)).strftime("%Y-%m-%d %H:%M:%S")
                 
@@ -930,7 +1079,6 @@ class DatabaseClient:
         
         vault_name = vault_name if vault_name else VAULT_NAME
         db_user = db_user if db_user else DEFAULT_DB_USER
-        vault = VaultAuth(vault_name=vault_name, credential=credential)
 
         if not db_name:
             self.db_name = ENTERPRISE_GEODATABASE_DB
@@ -942,15 +1090,25 @@ class DatabaseClient:
             logger.warning(
                 f"No database host provided, using default: {self.db_host}")
 
-        try:
-            logger.debug(
-                f"Getting database <{db_name}> credential for user <{db_user}> from vault")
-            secret_name = secret_name if secret_name else f"{db_user}-credential"
-            self.db_credential = vault.secret_client.get_secret(secret_name).value
+        secret_name = secret_name if secret_name else f"{db_user}-credential"
+        cached = DatabaseClient._vault_secrets.get((vault_name, secret_name))
+        if cached and time.monotonic() - cached[1] < DB_CREDENTIAL_CACHE_SECONDS:
+            logger.debug(f"Using cached database credential for user <{db_user}>")
+            self.db_credential = cached[0]
+        else:
+            try:
+                logger.debug(
+                    f"Getting database <{db_name}> credential for user <{db_user}> from vault")
+                vault = VaultAuth(vault_name=vault_name, credential=credential)
+                self.db_credential = vault.secret_client.get_secret(secret_name).value
+                
+            except Exception as e:
+                logger.error(f"Error getting database credential from vault: {e}")
+                raise
             
-        except Exception as e:
-            logger.error(f"Error getting database credential from vault: {e}")
-            raise
+            if self.db_credential and isinstance(self.db_credential, str):
+                DatabaseClient._vault_secrets[(vault_name, secret_name)] = (
+                    self.db_credential, time.monotonic())
 
         if self.db_credential and isinstance(self.db_credential, str):
             logger.info(
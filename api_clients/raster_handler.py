@@ -1,3 +1,4 @@
+from functools import lru_cache
 from os import cpu_count
 import uuid
 
@@ -15,6 +16,12 @@ from .storage_handler import StorageHandler
 from utils import *
 
 
+@lru_cache(maxsize=128)
+def _crs_from_epsg(epsg_code: int) -> CRS:
+    # EPSG lookups are pure and requests reuse a handful of codes
+    return CRS.from_epsg(epsg_code)
+
+
 class RasterHandler(StorageHandler):
     # init requires valid raster name
     def __init__(
@@ -848,7 +855,7 @@ class RasterHandler(StorageHandler):
     @staticmethod
     def CRS_from_epsg(epsg_code: int) -> CRS:
         try:
-            return CRS.from_epsg(epsg_code)
+            return _crs_from_epsg(epsg_code)
         except Exception as e:
             logger.error(f"Error creating CRS from EPSG code {epsg_code}: {e}")
             return None
@@ -858,7 +865,7 @@ class RasterHandler(StorageHandler):
 
         if epsg_code and isinstance(epsg_code, int):
             try:
-                CRS.from_epsg(epsg_code)
+                _crs_from_epsg(epsg_code)
                 return True
             except Exception as e:
                 # logger.error(f'Error: Invalid EPSG code: {epsg_code}')
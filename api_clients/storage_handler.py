@@ -1,17 +1,30 @@
 from azure.core.credentials import TokenCredential, AzureNamedKeyCredential
 from azure.core.exceptions import ResourceNotFoundError, ResourceExistsError
-from azure.identity import DefaultAzureCredential
+from azure.core.pipeline.transport import RequestsTransport
 from azure.storage.blob import BlobServiceClient, generate_blob_sas, BlobSasPermissions
 
 from datetime import datetime, timedelta
 import io
 from functools import wraps
 import os
+import requests
+from requests.adapters import HTTPAdapter
 import time
 import tempfile
 import zipfile
+from authorization import get_default_credential
 from utils import *
 
+# BlobServiceClients on the shared DefaultAzureCredential by account url, built once per worker
+_DEFAULT_BLOB_SERVICE_CLIENTS = dict()
+# containers seen to exist through a shared client by (account url, container) with check time
+_EXISTING_CONTAINERS = dict()
+
+# one pooled HTTP session for all blob clients, sized above urllib3's 10 connections per host
+# so parallel block uploads and concurrent copies do not queue on the pool
+_BLOB_SESSION = requests.Session()
+_BLOB_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=BLOB_POOL_MAXSIZE))
+
 
 class StorageHandler:
     VALID_EXTENSIONS = [
@@ -44,6 +57,7 @@ class StorageHandler:
 
 
         self.blob_service_client = None
+        self.shared_client = False
         self.credential = None
         self.account_key = None
         self.init_errors = []
@@ -62,7 +76,8 @@ class StorageHandler:
             logger.info("AzureNamedKeyCredential provided to StorageHandler")
         else:
             try:
-                self.credential = DefaultAzureCredential()
+                self.credential = get_default_credential()
+                self.shared_client = True
                 logger.info("DefaultAzureCredential initialized by StorageHandler")
             except Exception as e:
                 error_message = f"Error initializing DefaultAzureCredential: {e}"
@@ -76,10 +91,18 @@ class StorageHandler:
             account_url = f"https://{account_name}.blob.core.windows.net"
 
         try:
-            self.blob_service_client = BlobServiceClient(
-                account_url=account_url,
-                credential=self.credential,
-            )
+            if self.shared_client:
+                self.blob_service_client = _DEFAULT_BLOB_SERVICE_CLIENTS.get(account_url)
+            if not self.blob_service_client:
+                self.blob_service_client = BlobServiceClient(
+                    account_url=account_url,
+                    credential=self.credential,
+                    max_block_size=UPLOAD_BLOCK_SIZE,
+                    max_single_put_size=UPLOAD_BLOCK_SIZE,
+                    transport=RequestsTransport(session=_BLOB_SESSION, session_owner=False),
+                )
+                if self.shared_client:
+                    _DEFAULT_BLOB_SERVICE_CLIENTS[account_url] = self.blob_service_client
             logger.info(
                 f"StorageHandler initialized with BlobServiceClient for {account_url}"
             )
@@ -122,8 +145,10 @@ class StorageHandler:
             self.init_errors.append("BlobServiceClient not initialized: Uknown Error")
             
 
-        if self.workspace_container_name and self.container_exists(
-            self.workspace_container_name):
+        # a parameter-specified container was already checked above
+        if self.workspace_container_name and (
+            self.workspace_container_name == workspace_container_name
+            or self.container_exists(self.workspace_container_name)):
             logger.info(
                 f"StorageHandler initialized with workspace container: <{self.workspace_container_name}>"
             )
@@ -261,9 +286,16 @@ class StorageHandler:
 
         if isinstance(container_name, str):
             logger.debug(f"Checking if container {container_name} exists")
+            if self.shared_client:
+                key = (self.blob_service_client.url, container_name)
+                checked = _EXISTING_CONTAINERS.get(key)
+                if checked and time.monotonic() - checked < CONTAINER_CHECK_CACHE_SECONDS:
+                    return True
             try:
                 _exists = self.blob_service_client.get_container_client(
                     container=container_name).exists()
+                if _exists and self.shared_client:
+                    _EXISTING_CONTAINERS[key] = time.monotonic()
                 
                 return _exists
             
@@ -370,16 +402,21 @@ class StorageHandler:
             raise
 
         if wait_on_status:
-            status = self._check_copy_status(
-                container_name=dest_container_name, blob_name=dest_blob_name
-            )
-            while status != "success":
-
-                time.sleep(5)
+            # most copies within the account finish before the first poll, so start short and back off
+            status = copy_properties.get("copy_status")
+            delay = COPY_POLL_INITIAL_SECONDS
+            while status == "pending":
+                time.sleep(delay)
+                delay = min(delay * 2, COPY_POLL_MAX_SECONDS)
                 status = self.check_copy_status(
                     container_name=dest_container_name, blob_name=dest_blob_name
                 )
 
+            if status != "success":
+                message = f"Copy of {source_blob_name} to {dest_container_name}//{dest_blob_name} ended with status {status}"
+                logger.error(message)
+                raise StorageHandlerError(message)
+
             logger.info(f"{dest_blob_name} copied to {dest_container_name}")
 
             return dest_blob_name
@@ -420,6 +457,8 @@ class StorageHandler:
         dest_blob_name: str,
         container_name: str = None,
         overwrite: bool = False,
+        length: int = None,
+        max_concurrency: int = UPLOAD_MAX_CONCURRENCY,
     ):
 
         try:
@@ -449,7 +488,13 @@ class StorageHandler:
             blob_client = self.blob_service_client.get_blob_client(
                 container=container_name, blob=dest_blob_name
             )
-            blob_client.upload_blob(data=blob_data,overwrite=overwrite)
+            # blobs over UPLOAD_BLOCK_SIZE are sent as blocks on up to max_concurrency threads
+            blob_client.upload_blob(
+                data=blob_data,
+                overwrite=overwrite,
+                length=length,
+                max_concurrency=max_concurrency,
+            )
             logger.info(
                 f"Info: Blob {dest_blob_name} uploaded to container {container_name}"
             )
@@ -708,7 +753,7 @@ class StorageHandler:
         name_base = "".join(name_list[:-1])
         return f"{name_base}_{self._timestamp()}.{ext}"
 
-    def _check_copy_status(self, container_name: str, blob_name: str):
+    def check_copy_status(self, container_name: str, blob_name: str):
 
         try:
             blob_client = self.blob_service_client.get_blob_client(
@@ -727,7 +772,8 @@ class StorageHandler:
             logger.debug(f"Copy progress for {blob_name}: {copy_progress}")
         elif copy_status == "success":
             logger.info(f"Copy operation complete for {blob_name}")
-            return copy_status
+
+        return copy_status
 
     def _validate_file_name(self, file_name):
 
@@ -1,19 +1,352 @@
 import azure.functions as func
 import hashlib
 import json
+import logging
 import platform
 import os
 import sys
-from datetime import datetime, timedelta
+import threading
+import time
+from contextlib import contextmanager
 from typing import Dict, Any, Optional, Tuple
-from functools import wraps
+from functools import lru_cache, wraps
 from enum import Enum
 
+from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
 from psycopg2 import sql
+from psycopg2.extras import Json
 
 from api_clients import DatabaseClient
 from utils import *
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj, default=str) -> bytes:
+    # orjson returns bytes which func.HttpResponse accepts directly,
+    # default covers values neither encoder supports (Decimal, exceptions, version info)
+    if orjson:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS)
+    
+    return json.dumps(obj, default=default).encode("utf-8")
+
+
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+# error responses embed at most the latest log messages, dropped entirely past the byte limit
+ERROR_LOG_MAX_MESSAGES = 200
+ERROR_BODY_MAX_BYTES = 256 * 1024
+
+# operations-table client shared by all requests in this worker process
+_LOG_DB = None
+# serializes the one-time client creation and operations table DDL
+_LOG_DB_LOCK = threading.Lock()
+# True once the operations table is registered with pg_ttl_index
+_OPERATIONS_TTL_ENABLED = False
+
+# environment variables safe to report from get_environment_info
+ENVIRONMENT_ALLOWLIST = (
+    "FUNCTIONS_EXTENSION_VERSION",
+    "FUNCTIONS_WORKER_RUNTIME",
+    "REGION_NAME",
+    "WEBSITE_INSTANCE_ID",
+    "WEBSITE_SITE_NAME",
+)
+
+# HTTP status per exception class, resolved through the exception MRO
+_EXCEPTION_STATUS_CODES = {
+    ValueError: 400,
+    KeyError: 400,
+    TypeError: 400,
+    PermissionError: 403,
+    FileNotFoundError: 404,
+    ResourceNotFoundError: 404,
+    ResourceExistsError: 409,
+    InvalidFileTypeError: 415,
+    VectorHandlerError: 422,
+    RasterHandlerError: 422,
+    NotImplementedError: 501,
+    EnterpriseClientError: 502,
+    StorageHandlerError: 502,
+    DatabaseClientError: 503,
+    TimeoutError: 504,
+}
+
+
+@lru_cache(maxsize=128)
+def _exception_status_code(exc_type: type, default: int = 500) -> int:
+    # resolved once per exception type, subclasses map through their nearest listed base
+    for cls in exc_type.__mro__:
+        code = _EXCEPTION_STATUS_CODES.get(cls)
+        if code is not None:
+            return code
+    
+    return default
+
+
+# process-lifetime values for get_environment_info
+_STATIC_ENV = {
+    "os_name": os.name,
+    "cpu_count": os.cpu_count(),
+    "platform_system": platform.system(),
+    "platform_release": platform.release(),
+    "python_version": sys.version,
+    "python_version_info": tuple(sys.version_info),
+}
+
+# shared default response headers - never mutate
+_DEFAULT_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# prebuilt body for the plain success response - never mutate
+_SUCCESS_JSON = {"message": "Success"}
+_SUCCESS_BODY = _dumps(_SUCCESS_JSON)
+
+
+def _utc_timestamp() -> str:
+    # sortable UTC timestamp without allocating a datetime
+    return time.strftime(TIMESTAMP_FORMAT, time.gmtime())
+
+
+# raw Content-Type header -> whether it is JSON, bounded to avoid growth from unusual headers
+_CT_CACHE = dict()
+_CT_CACHE_SIZE = 64
+
+
+def _ct_is_json(content_type: str) -> bool:
+    if not content_type:
+        return False
+    
+    is_json = _CT_CACHE.get(content_type)
+    if is_json is None:
+        # media type leads the header, parameters such as charset follow it
+        is_json = content_type.lstrip().lower().startswith("application/json")
+        if len(_CT_CACHE) < _CT_CACHE_SIZE:
+            _CT_CACHE[content_type] = is_json
+    
+    return is_json
+
+
+def _dumps_text(obj, default=str) -> str:
+    # same fallback as _dumps so anything respond could encode can also be stored
+    if orjson:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    
+    return json.dumps(obj, default=default)
+
+
+def _jsonb(obj) -> Json:
+    # JSONB query parameter encoded once by the psycopg2 adapter
+    return Json(obj, dumps=_dumps_text)
+
+
+def _canonical_dumps(obj) -> bytes:
+    # key-sorted serialization used to hash request parameters
+    if orjson:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    
+    return json.dumps(obj, sort_keys=True, default=str).encode("utf-8")
+
+
+def _loads(raw: bytes):
+    # orjson parses bytes without a separate utf-8 decode, both raise json.JSONDecodeError
+    if orjson:
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # stdlib json also accepts NaN/Infinity literals that orjson rejects
+            pass
+    
+    return json.loads(raw)
+
+
+# Operations table statements, composed once at import
+_OPERATIONS_TABLE_IDENTIFIERS = dict(
+    schema_name=sql.Identifier(HOSTING_SCHEMA_NAME),
+    table_name=sql.Identifier(OPERATIONS_TABLE_NAME),
+    services_table_name=sql.Identifier(PUBLISHED_SERVICES_TABLE_NAME),
+)
+
+_CREATE_OPERATIONS_SQL = sql.SQL("""
+    CREATE TABLE IF NOT EXISTS {schema_name}.{table_name} (
+        operation_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+        operation_type VARCHAR(50) NOT NULL,
+        request_id VARCHAR(255) NOT NULL,
+        parameters JSONB,
+        operation_status VARCHAR(50) NOT NULL DEFAULT 'queued',
+        priority INTEGER DEFAULT 5,
+        started_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        queued_at TIMESTAMP,
+        processing_started_at TIMESTAMP,
+        completed_at TIMESTAMP,
+        expires_at TIMESTAMP DEFAULT (CURRENT_TIMESTAMP + INTERVAL '24 hours'),
+        result JSONB,
+        error_details JSONB,
+        retry_count INTEGER DEFAULT 0,
+        max_retries INTEGER DEFAULT 3,
+        logs JSONB,
+        published_services JSONB DEFAULT '[]'::jsonb,
+        CONSTRAINT unique_request UNIQUE (request_id, operation_type)
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_operations_type_status 
+        ON {schema_name}.{table_name}(operation_type, operation_status);
+    CREATE INDEX IF NOT EXISTS idx_operations_live 
+        ON {schema_name}.{table_name}(request_id, operation_type)
+        WHERE operation_status IN ('queued', 'running');
+    CREATE INDEX IF NOT EXISTS idx_operations_expiry_live 
+        ON {schema_name}.{table_name}(expires_at)
+        WHERE operation_status IN ('queued', 'running');
+    CREATE INDEX IF NOT EXISTS idx_operations_expired_cleanup 
+        ON {schema_name}.{table_name}(expires_at)
+        WHERE operation_status IN ('completed', 'failed', 'expired');
+
+    CREATE TABLE IF NOT EXISTS {schema_name}.{services_table_name} (
+        operation_id UUID NOT NULL
+            REFERENCES {schema_name}.{table_name}(operation_id) ON DELETE CASCADE,
+        seq SERIAL,
+        service_info JSONB NOT NULL,
+        PRIMARY KEY (operation_id, seq)
+    );
+
+    DROP INDEX IF EXISTS {schema_name}.idx_operations_status;
+    DROP INDEX IF EXISTS {schema_name}.idx_operations_expires;
+    DROP INDEX IF EXISTS {schema_name}.idx_operations_request_id;
+""").format(**_OPERATIONS_TABLE_IDENTIFIERS)
+
+# CONCURRENTLY cannot run in a transaction block, executed on its own in autocommit
+_CREATE_PARAMETERS_INDEX_SQL = sql.SQL("""
+    CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_operations_params_gin
+        ON {schema_name}.{table_name} USING GIN (parameters jsonb_path_ops)
+""").format(**_OPERATIONS_TABLE_IDENTIFIERS)
+
+# unique_request allows one row per request, answered by a single probe of its index
+# published services come from the child table, the legacy array column covers older rows
+_SELECT_OPERATION_SQL = sql.SQL("""
+    SELECT operations.operation_id, operation_status, result, error_details, 
+           completed_at, expires_at, retry_count,
+           COALESCE(services.published_services, operations.published_services)
+    FROM {schema_name}.{table_name} AS operations
+    LEFT JOIN LATERAL (
+        SELECT jsonb_agg(service_info ORDER BY seq) AS published_services
+        FROM {schema_name}.{services_table_name}
+        WHERE operation_id = operations.operation_id
+    ) AS services ON true
+    WHERE request_id = %s AND operation_type = %s
+    AND (expires_at IS NULL OR expires_at > CURRENT_TIMESTAMP)
+""").format(**_OPERATIONS_TABLE_IDENTIFIERS)
+
+# takes over a queued or expired row for the same request, or a failed row with retries
+# left, returns no row while another request holds the operation running or completed
+# (or always takes over when forced)
+# operations run synchronously so they are inserted as running, processing_started_at
+# is only left NULL for queued inserts
+# services tracked by an earlier attempt are deleted on takeover so the retry only reports its own
+_INSERT_OPERATION_SQL = sql.SQL("""
+    WITH claimed AS (
+        INSERT INTO {schema_name}.{table_name} AS operations
+            (request_id, operation_type, parameters, operation_status, 
+             queued_at, processing_started_at, expires_at)
+        VALUES (%s, %s, %s::jsonb, %s, CURRENT_TIMESTAMP,
+                CASE WHEN %s THEN NULL ELSE CURRENT_TIMESTAMP END,
+                CURRENT_TIMESTAMP + make_interval(hours => %s))
+        ON CONFLICT (request_id, operation_type) DO UPDATE SET
+            parameters = EXCLUDED.parameters,
+            operation_status = EXCLUDED.operation_status,
+            started_at = CURRENT_TIMESTAMP,
+            queued_at = EXCLUDED.queued_at,
+            processing_started_at = EXCLUDED.processing_started_at,
+            completed_at = NULL,
+            expires_at = EXCLUDED.expires_at,
+            result = NULL,
+            error_details = NULL,
+            published_services = '[]'::jsonb,
+            retry_count = operations.retry_count
+                + CASE WHEN operations.operation_status = 'failed' THEN 1 ELSE 0 END
+        WHERE %s
+            OR operations.expires_at <= CURRENT_TIMESTAMP
+            OR operations.operation_status = 'queued'
+            OR (operations.operation_status = 'failed'
+                AND operations.retry_count < operations.max_retries)
+        RETURNING operation_id
+    ), cleared AS (
+        DELETE FROM {schema_name}.{services_table_name}
+        WHERE operation_id IN (SELECT operation_id FROM claimed)
+    )
+    SELECT operation_id FROM claimed
+""").format(**_OPERATIONS_TABLE_IDENTIFIERS)
+
+_INCREMENT_RETRY_SQL = sql.SQL("""
+    UPDATE {schema_name}.{table_name} 
+    SET retry_count = retry_count + 1,
+        operation_status = 'queued'
+    WHERE operation_id = %s
+""").format(**_OPERATIONS_TABLE_IDENTIFIERS)
+
+_TRACK_SERVICE_SQL = sql.SQL("""
+    INSERT INTO {schema_name}.{services_table_name} (operation_id, service_info)
+    VALUES (%s, %s::jsonb)
+""").format(**_OPERATIONS_TABLE_IDENTIFIERS)
+
+# processing_started_at is stamped when an operation moves to running
+_UPDATE_OPERATION_STATUS_SQL = sql.SQL("""
+    UPDATE {schema_name}.{table_name} 
+    SET operation_status = %s,
+        processing_started_at = CASE WHEN %s = 'running'
+            THEN CURRENT_TIMESTAMP ELSE processing_started_at END
+    WHERE operation_id = %s
+""").format(**_OPERATIONS_TABLE_IDENTIFIERS)
+
+# failed operations store their data in error_details, successful ones in result
+_COMPLETE_OPERATION_SQL = sql.SQL("""
+    UPDATE {schema_name}.{table_name} 
+    SET operation_status = %s,
+        completed_at = CURRENT_TIMESTAMP,
+        result = COALESCE(%s::jsonb, result),
+        error_details = COALESCE(%s::jsonb, error_details)
+    WHERE operation_id = %s
+""").format(**_OPERATIONS_TABLE_IDENTIFIERS)
+
+# hot statements PREPAREd once per pooled connection of the operations DatabaseClient
+_PREPARED_OPERATION_STATEMENTS = {
+    "select_operation": _SELECT_OPERATION_SQL,
+    "insert_operation": _INSERT_OPERATION_SQL,
+}
+
+_OPERATIONS_TABLE_SQL = sql.SQL("{schema_name}.{table_name}").format(**_OPERATIONS_TABLE_IDENTIFIERS)
+
+# pg_ttl_index background worker deletes rows the grace period after expires_at has passed,
+# registered only once so cold starts do not re-issue it
+_CREATE_TTL_INDEX_SQL = sql.SQL("""
+    SELECT ttl_create_index(%s, %s, %s)
+    WHERE NOT EXISTS (
+        SELECT 1 FROM ttl_index_table
+        WHERE table_name::regclass = %s::regclass AND column_name = %s
+    )
+""")
+
+# one branch per status group so each matches the predicate of a partial expiry index,
+# deletes at most one batch per statement to bound lock duration
+_DELETE_EXPIRED_SQL = sql.SQL("""
+    DELETE FROM {schema_name}.{table_name}
+    WHERE operation_id IN (
+        SELECT operation_id FROM {schema_name}.{table_name}
+        WHERE (expires_at < CURRENT_TIMESTAMP - INTERVAL '%s days'
+               AND operation_status IN ('completed', 'failed', 'expired'))
+           OR (expires_at < CURRENT_TIMESTAMP - INTERVAL '%s days'
+               AND operation_status IN ('queued', 'running'))
+        LIMIT %s
+    )
+""").format(**_OPERATIONS_TABLE_IDENTIFIERS)
+
+_CLEANUP_BATCH_SIZE = 10000
+
+# days expired operations are kept before they are deleted
+_OPERATIONS_RETENTION_DAYS = 7
+
+
 class OperationStatus(Enum):
     QUEUED = "queued"
     RUNNING = "running" 
@@ -21,6 +354,63 @@ class OperationStatus(Enum):
     FAILED = "failed"
     EXPIRED = "expired"
 
+class RecentResults:
+    """Successful command results by input key, reused for ttl seconds to absorb retries and double sends"""
+
+    def __init__(self, ttl: float, maxsize: int = 256):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._results = dict()
+        self._inflight = dict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the cached result for key, or None if missing or expired"""
+        cached = self._results.get(key)
+        if cached and time.monotonic() - cached[1] < self.ttl:
+            return cached[0]
+        return None
+
+    def put(self, key, result):
+        with self._lock:
+            self._results.pop(key, None)
+            if len(self._results) >= self.maxsize:
+                # oldest entry first in insertion order
+                del self._results[next(iter(self._results))]
+            self._results[key] = (result, time.monotonic())
+
+    @contextmanager
+    def single_flight(self, key, timeout: float):
+        """Let one caller per key run the block at a time.
+
+        Later callers wait up to timeout for the first and get its stored result. If it finishes
+        without storing one, exactly one waiter takes over and runs the block while the others keep
+        waiting. Raises TimeoutError when no result arrives within timeout rather than running the
+        block alongside the caller that holds the key.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                event = self._inflight.get(key)
+                if event is None:
+                    event = self._inflight[key] = threading.Event()
+                    break
+            
+            if not event.wait(max(0.0, deadline - time.monotonic())):
+                raise TimeoutError(f"Concurrent run for the same input still in progress after {timeout} seconds")
+            cached = self.get(key)
+            if cached is not None:
+                yield cached
+                return
+
+        try:
+            yield self.get(key)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            event.set()
+
+
 class BaseRequest:
     """Enhanced BaseRequest with comprehensive idempotent operation tracking"""
     
@@ -29,27 +419,25 @@ class BaseRequest:
         self.response = None
         self.env_dict = None
         self.content_type = None
+        self._is_json_ct = False
         self.req_json = None
         self.req = req
+        # (response, body dict) of the last respond call, see _extract_result_data
+        self._last_response = None
         
         # Idempotency configuration
         self.operation_timeout_hours = 24
         self.enable_idempotency = True
         self.operation_id = None
         self.request_id = None
+        self._existing_operation_handlers = {
+            OperationStatus.COMPLETED.value: self._handle_completed_operation,
+            OperationStatus.RUNNING.value: self._handle_running_operation,
+            OperationStatus.FAILED.value: self._handle_failed_operation,
+        }
         
-        try:
-            logger.debug("Initializing DatabaseClient for operation tracking")
-            self.log_db = DatabaseClient.from_vault()
-            self._ensure_operations_table()
-            logger.debug("DatabaseClient initialized")
-            
-        except Exception as e:
-            message_out = f"Could not initialize DatabaseClient for logging: {e}"
-            logger.critical(message_out)
-            self.response = self.return_error(message_out)
-            self.log_db = None
-            self.enable_idempotency = False
+        # error_log in responses only carries this request's messages
+        self.log_messages = log_list.capture()
 
         # Parse request content
         self._parse_request_content(use_json)
@@ -61,20 +449,23 @@ class BaseRequest:
         try:
             logger.debug("Getting content type from request headers")
             self.content_type = self.req.headers.get("Content-Type")
-            logger.debug(f"Content-Type: {self.content_type}")
+            logger.debug("Content-Type: %s", self.content_type)
             
         except Exception as e:
             self.content_type = None
-            use_json = False
             message_out = f"Could not get content type from request headers {e}"
             logger.critical(message_out)
             self.response = self.return_error(message_out)
+            return
             
-        if self.content_type and "application/json" in self.content_type:
+        self._is_json_ct = _ct_is_json(self.content_type)
+        if self._is_json_ct:
             logger.debug("application/json found, parsing JSON")
             try:
-                self.req_json = self.req.get_json()
-                logger.debug(f"JSON: {self.req_json}")
+                raw = self.req.get_body()
+                self.req_json = _loads(raw) if raw else None
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("JSON: %s", self.req_json)
                 logger.info("Request JSON parsed successfully")
             except Exception as e:
                 message_out = f"Error: could not get JSON from request {e}"
@@ -91,52 +482,65 @@ class BaseRequest:
             logger.debug("Request initialized without JSON requirement")
             self.req_json = None
 
-    def _ensure_operations_table(self):
-        """Ensure the operations table exists with proper schema"""
-        schema_name = HOSTING_SCHEMA_NAME
-        table_name = OPERATIONS_TABLE_NAME
+    @property
+    def log_db(self) -> Optional[DatabaseClient]:
+        """DatabaseClient for operation tracking, created on first use and reused by the worker"""
+        global _LOG_DB
         
+        if _LOG_DB is None and self.enable_idempotency:
+            with _LOG_DB_LOCK:
+                if _LOG_DB is None:
+                    try:
+                        logger.debug("Initializing DatabaseClient for operation tracking")
+                        log_db = DatabaseClient.from_vault()
+                        self._ensure_operations_table(log_db)
+                        for name, statement in _PREPARED_OPERATION_STATEMENTS.items():
+                            log_db.register_prepared_statement(name, statement)
+                        _LOG_DB = log_db
+                        logger.debug("DatabaseClient initialized")
+                        
+                    except Exception as e:
+                        logger.critical(f"Could not initialize DatabaseClient for logging: {e}")
+                        self.enable_idempotency = False
+        
+        return _LOG_DB
+
+    def _ensure_operations_table(self, log_db: DatabaseClient):
+        """Ensure the operations table exists with proper schema"""
         try:
-            self.log_db.query(
-                sql.SQL("""
-                    CREATE TABLE IF NOT EXISTS {schema_name}.{table_name} (
-                        operation_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                        operation_type VARCHAR(50) NOT NULL,
-                        request_id VARCHAR(255) NOT NULL,
-                        parameters JSONB,
-                        operation_status VARCHAR(50) NOT NULL DEFAULT 'queued',
-                        priority INTEGER DEFAULT 5,
-                        started_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
-                        queued_at TIMESTAMP,
-                        processing_started_at TIMESTAMP,
-                        completed_at TIMESTAMP,
-                        expires_at TIMESTAMP DEFAULT (CURRENT_TIMESTAMP + INTERVAL '24 hours'),
-                        result JSONB,
-                        error_details JSONB,
-                        retry_count INTEGER DEFAULT 0,
-                        max_retries INTEGER DEFAULT 3,
-                        logs JSONB,
-                        published_services JSONB DEFAULT '[]'::jsonb,
-                        CONSTRAINT unique_request UNIQUE (request_id, operation_type)
-                    );
-                    
-                    CREATE INDEX IF NOT EXISTS idx_operations_status 
-                        ON {schema_name}.{table_name}(operation_status);
-                    CREATE INDEX IF NOT EXISTS idx_operations_type_status 
-                        ON {schema_name}.{table_name}(operation_type, operation_status);
-                    CREATE INDEX IF NOT EXISTS idx_operations_expires 
-                        ON {schema_name}.{table_name}(expires_at);
-                    CREATE INDEX IF NOT EXISTS idx_operations_request_id 
-                        ON {schema_name}.{table_name}(request_id);
-                """).format(
-                    schema_name=sql.Identifier(schema_name),
-                    table_name=sql.Identifier(table_name)
-                )
+            log_db.query(
+                _CREATE_OPERATIONS_SQL
             )
             logger.debug("Operations table schema ensured")
         except Exception as e:
             logger.error(f"Failed to ensure operations table: {e}")
             raise
+        
+        try:
+            # connect() wraps the connection in a transaction block, which CONCURRENTLY rejects
+            with log_db.autocommit_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(_CREATE_PARAMETERS_INDEX_SQL)
+            logger.debug("Operations parameters index ensured")
+        except Exception as e:
+            # lookups by request_id do not depend on this index
+            logger.warning(f"Failed to ensure operations parameters index: {e}")
+        
+        global _OPERATIONS_TTL_ENABLED
+        try:
+            with log_db.connect() as conn:
+                operations_table = _OPERATIONS_TABLE_SQL.as_string(conn)
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        _CREATE_TTL_INDEX_SQL,
+                        [operations_table, "expires_at", _OPERATIONS_RETENTION_DAYS * 24 * 60 * 60,
+                         operations_table, "expires_at"]
+                    )
+            _OPERATIONS_TTL_ENABLED = True
+            logger.debug("Operations TTL index ensured")
+        except Exception as e:
+            # without the extension expired rows are removed by cleanup_expired_operations
+            logger.info(f"pg_ttl_index not available for operations table: {e}")
 
     def idempotent_operation(self, 
                            operation_type: str,
@@ -152,7 +556,7 @@ class BaseRequest:
             parameters: Parameters for operation (defaults to self.req_json)
             force_new: Force new operation even if duplicate exists
         """
-        if not self.enable_idempotency:
+        if not self.enable_idempotency or self.log_db is None:
             logger.warning("Idempotency disabled, executing operation directly")
             return operation_func()
             
@@ -161,23 +565,18 @@ class BaseRequest:
         # Generate deterministic request ID
         self.request_id = self._generate_request_id(operation_type, parameters)
         
-        # Check for existing operation
-        if not force_new:
-            existing_operation = self._get_existing_operation(self.request_id, operation_type)
-            if existing_operation:
-                return self._handle_existing_operation(existing_operation, operation_type)
-        
-        # Start new operation
-        self.operation_id = self._start_operation(self.request_id, operation_type, parameters)
+        # Claim the operation, answers from the existing row when another request holds it
+        self.operation_id, response = self._try_claim_operation(
+            self.request_id, operation_type, parameters, force=force_new)
+        if response is not None:
+            return response
+        if self.operation_id is None:
+            logger.warning(f"Could not claim {operation_type} operation, executing without tracking")
+            return operation_func()
         
         try:
             # Execute the operation
             logger.info(f"Executing new {operation_type} operation: {self.operation_id}")
-            status_updated = self._update_operation_status(self.operation_id, OperationStatus.RUNNING)
-            if not status_updated:
-                logger.error(f"Idempotency error - Failed to update operation {self.operation_id} to running status")
-
-            
             result = operation_func()
             
             # Extract result data for storage
@@ -195,7 +594,7 @@ class BaseRequest:
             error_details = {
                 "error": str(e),
                 "error_type": type(e).__name__,
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": _utc_timestamp()
             }
             _completed = self._complete_operation(self.operation_id, OperationStatus.FAILED, error_details)
             if not _completed:
@@ -205,32 +604,20 @@ class BaseRequest:
     def _generate_request_id(self, operation_type: str, parameters: Dict[str, Any]) -> str:
         """Generate deterministic request ID for idempotency"""
         # Create a stable hash from operation type and parameters
-        param_str = json.dumps(parameters or {}, sort_keys=True, default=str)
-        hash_input = f"{operation_type}:{param_str}"
-        request_id = hashlib.sha256(hash_input.encode()).hexdigest()
+        # 64-bit digest is enough to dedupe within the expiry window and keeps index keys short
+        request_hash = hashlib.blake2b(operation_type.encode(), digest_size=8)
+        request_hash.update(b":")
+        request_hash.update(_canonical_dumps(parameters or {}))
+        request_id = request_hash.hexdigest()
         
-        logger.debug(f"Generated request_id: {request_id[:12]}... for {operation_type}")
+        logger.debug("Generated request_id: %s... for %s", request_id[:12], operation_type)
         return request_id
 
     def _get_existing_operation(self, request_id: str, operation_type: str) -> Optional[Dict]:
         """Get existing operation by request_id and operation_type"""
-        schema_name = HOSTING_SCHEMA_NAME
-        table_name = OPERATIONS_TABLE_NAME
-        
         try:
-            result = self.log_db.query(
-                sql.SQL("""
-                    SELECT operation_id, operation_status, result, error_details, 
-                           completed_at, expires_at, retry_count, published_services
-                    FROM {schema_name}.{table_name} 
-                    WHERE request_id = %s AND operation_type = %s
-                    AND (expires_at IS NULL OR expires_at > CURRENT_TIMESTAMP)
-                    ORDER BY started_at DESC
-                    LIMIT 1
-                """).format(
-                    schema_name=sql.Identifier(schema_name),
-                    table_name=sql.Identifier(table_name)
-                ),
+            result = self.log_db.query_prepared(
+                "select_operation",
                 [request_id, operation_type]
             )
             
@@ -245,7 +632,7 @@ class BaseRequest:
                     'retry_count': result[0][6],
                     'published_services': result[0][7] or []
                 }
-                logger.debug(f"Found existing operation: {operation['operation_id']} with status: {operation['operation_status']}")
+                logger.debug("Found existing operation: %s with status: %s", operation['operation_id'], operation['operation_status'])
                 return operation
                 
         except Exception as e:
@@ -255,90 +642,98 @@ class BaseRequest:
 
     def _handle_existing_operation(self, operation: Dict, operation_type: str) -> func.HttpResponse:
         """Handle response for existing operations based on their status"""
-        status = operation['operation_status']
+        handler = self._existing_operation_handlers.get(operation['operation_status'])
+        
+        return handler(operation, operation_type) if handler else None  # None signals to execute new operation
+
+    def _handle_completed_operation(self, operation: Dict, operation_type: str) -> func.HttpResponse:
         operation_id = operation['operation_id']
+        logger.info(f"Returning cached result for completed operation: {operation_id}")
+        result_data = operation.get('result', {})
         
-        if status == OperationStatus.COMPLETED.value:
-            logger.info(f"Returning cached result for completed operation: {operation_id}")
-            result_data = operation.get('result', {})
-            
-            # Add operation metadata to response
-            if isinstance(result_data, dict):
-                result_data.update({
-                    'operation_id': str(operation_id),
-                    'operation_status': 'completed',
-                    'completed_at': operation.get('completed_at'),
-                    'cached_result': True
-                })
-                
-            return self.return_success(
-                message=f"Operation completed (cached result)",
-                json_out=result_data
-            )
-            
-        elif status == OperationStatus.RUNNING.value:
-            logger.info(f"Operation {operation_id} still in progress")
-            return self.return_success(
-                message=f"Operation in progress",
-                json_out={
-                    'operation_id': str(operation_id),
-                    'operation_status': 'in_progress',
-                    'started_at': operation.get('started_at')
-                },
-                code=202  # Accepted
-            )
-            
-        elif status == OperationStatus.FAILED.value:
-            logger.warning(f"Previous operation {operation_id} failed")
-            retry_count = operation.get('retry_count', 0)
-            max_retries = 3  # Could be configurable
+        # Add operation metadata to response
+        if isinstance(result_data, dict):
+            result_data.update({
+                'operation_id': str(operation_id),
+                'operation_status': 'completed',
+                'completed_at': operation.get('completed_at'),
+                'cached_result': True
+            })
             
-            if retry_count < max_retries:
-                logger.info(f"Retrying failed operation {operation_id} (attempt {retry_count + 1})")
-                self._increment_retry_count(operation_id)
-                return None  # Signal to execute new operation
-            else:
-                error_details = operation.get('error_details', {})
-                return self.return_error(
-                    message=f"Operation failed after {max_retries} retries",
-                    json_out={
-                        'operation_id': str(operation_id),
-                        'operation_status': 'failed',
-                        'error_details': error_details,
-                        'max_retries_exceeded': True
-                    },
-                    code=422
-                )
+        return self.return_success(
+            message=f"Operation completed (cached result)",
+            json_out=result_data
+        )
+
+    def _handle_running_operation(self, operation: Dict, operation_type: str) -> func.HttpResponse:
+        operation_id = operation['operation_id']
+        logger.info(f"Operation {operation_id} still in progress")
+        return self.return_success(
+            message=f"Operation in progress",
+            json_out={
+                'operation_id': str(operation_id),
+                'operation_status': 'in_progress',
+                'started_at': operation.get('started_at')
+            },
+            code=202  # Accepted
+        )
+
+    def _handle_failed_operation(self, operation: Dict, operation_type: str) -> func.HttpResponse:
+        operation_id = operation['operation_id']
+        logger.warning(f"Previous operation {operation_id} failed")
+        retry_count = operation.get('retry_count', 0)
+        max_retries = 3  # Could be configurable
+        
+        if retry_count < max_retries:
+            logger.info(f"Retrying failed operation {operation_id} (attempt {retry_count + 1})")
+            self._increment_retry_count(operation_id)
+            return None  # Signal to execute new operation
         
-        return None  # Signal to execute new operation
+        error_details = operation.get('error_details', {})
+        return self.return_error(
+            message=f"Operation failed after {max_retries} retries",
+            json_out={
+                'operation_id': str(operation_id),
+                'operation_status': 'failed',
+                'error_details': error_details,
+                'max_retries_exceeded': True
+            },
+            code=422
+        )
 
-    def _start_operation(self, request_id: str, operation_type: str, parameters: Dict) -> str:
-        """Start a new operation and return operation_id"""
-        schema_name = HOSTING_SCHEMA_NAME
-        table_name = OPERATIONS_TABLE_NAME
+    def _try_claim_operation(self, request_id: str, operation_type: str, parameters: Dict,
+                             force: bool = False) -> Tuple[Optional[str], Optional[func.HttpResponse]]:
+        """Claim operation in one insert, returns (operation_id, None) or (None, response for the existing operation)"""
+        operation_id = self._start_operation(request_id, operation_type, parameters, force=force)
+        if operation_id is not None:
+            return operation_id, None
         
-        expires_at = datetime.utcnow() + timedelta(hours=self.operation_timeout_hours)
+        existing_operation = self._get_existing_operation(request_id, operation_type)
+        if existing_operation:
+            return None, self._handle_existing_operation(existing_operation, operation_type)
+        return None, None
+
+    def _start_operation(self, request_id: str, operation_type: str, parameters: Dict,
+                         queued: bool = False, force: bool = False) -> Optional[str]:
+        """Start a new running operation (or queued if queued=True) and return operation_id, None if another request holds it"""
+        status = OperationStatus.QUEUED if queued else OperationStatus.RUNNING
         
         try:
             with self.log_db.connect() as conn:
                 with conn.cursor() as cursor:
-                    cursor.execute(sql.SQL("""
-                        INSERT INTO {schema_name}.{table_name} 
-                            (request_id, operation_type, parameters, operation_status, 
-                             queued_at, expires_at)
-                        VALUES (%s, %s, %s::jsonb, %s, CURRENT_TIMESTAMP, %s)
-                        RETURNING operation_id
-                    """).format(
-                        schema_name=sql.Identifier(schema_name),
-                        table_name=sql.Identifier(table_name)
-                    ),
-                    [request_id, operation_type, json.dumps(parameters or {}), 
-                     OperationStatus.QUEUED.value, expires_at]
+                    self.log_db.execute_prepared(
+                        cursor,
+                        "insert_operation",
+                        [request_id, operation_type, _jsonb(parameters or {}),
+                         status.value, queued, int(self.operation_timeout_hours), force]
                     )
-                    operation_id = cursor.fetchone()[0]
+                    row = cursor.fetchone()
                     conn.commit()
-                    logger.info(f"Started new operation: {operation_id}")
-                    return str(operation_id)
+                    if row is None:
+                        logger.info(f"Operation {request_id[:12]}... already held by another request")
+                        return None
+                    logger.info(f"Started new operation: {row[0]}")
+                    return str(row[0])
         except (TypeError, ValueError) as e:
             logger.error(f"Data serialization failed: {e}")
             raise  
@@ -348,78 +743,33 @@ class BaseRequest:
 
     def _update_operation_status(self, operation_id: str, status: OperationStatus):
         """Update operation status"""
-        schema_name = HOSTING_SCHEMA_NAME
-        table_name = OPERATIONS_TABLE_NAME
-        
-        status_field_map = {
-            OperationStatus.RUNNING: 'processing_started_at'
-        }
-        
-        timestamp_field = status_field_map.get(status)
-        
-        if timestamp_field:
-            query = sql.SQL("""
-                UPDATE {schema_name}.{table_name} 
-                SET operation_status = %s, {timestamp_field} = CURRENT_TIMESTAMP
-                WHERE operation_id = %s
-            """).format(
-                schema_name=sql.Identifier(schema_name),
-                table_name=sql.Identifier(table_name),
-                timestamp_field=sql.Identifier(timestamp_field)
-            )
-        else:
-            query = sql.SQL("""
-                UPDATE {schema_name}.{table_name} 
-                SET operation_status = %s
-                WHERE operation_id = %s
-            """).format(
-                schema_name=sql.Identifier(schema_name),
-                table_name=sql.Identifier(table_name)
-            )
-            
         try:
-            self.log_db.query(query, [status.value, operation_id])
-            logger.debug(f"Updated operation {operation_id} status to {status.value}")
+            with self.log_db.connect() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        _UPDATE_OPERATION_STATUS_SQL,
+                        [status.value, status.value, str(operation_id)]
+                    )
+            logger.debug("Updated operation %s status to %s", operation_id, status.value)
             return True
         except Exception as e:
             logger.error(f"Idempotency error - Failed to update operation status: {e}")
             return False
 
     def _complete_operation(self, operation_id: str, status: OperationStatus, result_data: Dict):
-        """Mark operation as completed with result data"""
-        schema_name = HOSTING_SCHEMA_NAME
-        table_name = OPERATIONS_TABLE_NAME
-        
+        """Mark operation as completed with result data, written before the request returns"""
+        data = _jsonb(result_data) if result_data is not None else None
         try:
-            if status == OperationStatus.FAILED:
-                # For failed operations, store error in error_details
-                self.log_db.query(sql.SQL("""
-                    UPDATE {schema_name}.{table_name} 
-                    SET operation_status = %s, 
-                        completed_at = CURRENT_TIMESTAMP,
-                        error_details = %s::jsonb
-                    WHERE operation_id = %s
-                """).format(
-                    schema_name=sql.Identifier(schema_name),
-                    table_name=sql.Identifier(table_name)
-                ),
-                [status.value, json.dumps(result_data), operation_id]
-                )
-            else:
-                # For successful operations, store in result
-                self.log_db.query(sql.SQL("""
-                    UPDATE {schema_name}.{table_name} 
-                    SET operation_status = %s, 
-                        completed_at = CURRENT_TIMESTAMP,
-                        result = %s::jsonb
-                    WHERE operation_id = %s
-                """).format(
-                    schema_name=sql.Identifier(schema_name),
-                    table_name=sql.Identifier(table_name)
-                ),
-                [status.value, json.dumps(result_data), operation_id]
-                )
-                
+            # one UPDATE per operation so a row Postgres rejects only fails its own request
+            with self.log_db.connect() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        _COMPLETE_OPERATION_SQL,
+                        [status.value,
+                         data if status == OperationStatus.COMPLETED else None,
+                         data if status == OperationStatus.FAILED else None,
+                         str(operation_id)]
+                    )
             logger.info(f"Completed operation {operation_id} with status {status.value}")
             
             return True
@@ -434,20 +784,10 @@ class BaseRequest:
 
     def _increment_retry_count(self, operation_id: str):
         """Increment retry count for failed operation"""
-        schema_name = HOSTING_SCHEMA_NAME
-        table_name = OPERATIONS_TABLE_NAME
-        
         try:
-            self.log_db.query(sql.SQL("""
-                UPDATE {schema_name}.{table_name} 
-                SET retry_count = retry_count + 1,
-                    operation_status = 'queued'
-                WHERE operation_id = %s
-            """).format(
-                schema_name=sql.Identifier(schema_name),
-                table_name=sql.Identifier(table_name)
-            ),
-            [operation_id]
+            self.log_db.query(
+                _INCREMENT_RETRY_SQL,
+                [operation_id]
             )
         except Exception as e:
             logger.error(f"Failed to increment retry count: {e}")
@@ -456,20 +796,24 @@ class BaseRequest:
         """Extract meaningful data from HTTP response for storage"""
         if not result:
             return {}
+        
+        # responses built by respond hand over their body dict without a re-parse
+        if self._last_response is not None and self._last_response[0] is result:
+            return self._last_response[1]
             
         try:
             # Try to parse JSON body
             if hasattr(result, 'get_body'):
                 body = result.get_body()
                 if body:
-                    return json.loads(body.decode('utf-8'))
+                    return _loads(body)
         except (json.JSONDecodeError, UnicodeDecodeError):
             pass
             
         # Fallback to basic response info
         return {
             'status_code': getattr(result, 'status_code', None),
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': _utc_timestamp()
         }
 
     def track_published_service(self, service_info: Dict):
@@ -478,43 +822,37 @@ class BaseRequest:
             logger.warning("No operation_id available for service tracking")
             return
             
-        schema_name = HOSTING_SCHEMA_NAME
-        table_name = OPERATIONS_TABLE_NAME
-        
         try:
-            self.log_db.query(sql.SQL("""
-                UPDATE {schema_name}.{table_name} 
-                SET published_services = published_services || %s::jsonb
-                WHERE operation_id = %s
-            """).format(
-                schema_name=sql.Identifier(schema_name),
-                table_name=sql.Identifier(table_name)
-            ),
-            [json.dumps(service_info), self.operation_id]
+            self.log_db.query(
+                _TRACK_SERVICE_SQL,
+                [self.operation_id, _jsonb(service_info)]
             )
             logger.info(f"Tracked published service for operation {self.operation_id}")
         except Exception as e:
             logger.error(f"Failed to track published service: {e}")
 
-    def cleanup_expired_operations(self, days_old: int = 7):
-        """Clean up old expired operations (call periodically)"""
-        schema_name = HOSTING_SCHEMA_NAME
-        table_name = OPERATIONS_TABLE_NAME
+    def cleanup_expired_operations(self, days_old: int = _OPERATIONS_RETENTION_DAYS):
+        """Clean up old expired operations (call periodically when pg_ttl_index is not available)"""
+        if _OPERATIONS_TTL_ENABLED:
+            logger.debug("Expired operations are removed by pg_ttl_index, skipping cleanup")
+            return
         
+        deleted = 0
         try:
-            result = self.log_db.query(sql.SQL("""
-                DELETE FROM {schema_name}.{table_name}
-                WHERE expires_at < CURRENT_TIMESTAMP - INTERVAL '%s days'
-                RETURNING operation_id
-            """).format(
-                schema_name=sql.Identifier(schema_name),
-                table_name=sql.Identifier(table_name)
-            ),
-            [days_old]
-            )
+            while True:
+                with self.log_db.connect() as conn:
+                    with conn.cursor() as cursor:
+                        cursor.execute(
+                            _DELETE_EXPIRED_SQL,
+                            [days_old, days_old, _CLEANUP_BATCH_SIZE]
+                        )
+                        batch_deleted = cursor.rowcount
+                deleted += batch_deleted
+                if batch_deleted < _CLEANUP_BATCH_SIZE:
+                    break
             
-            if result:
-                logger.info(f"Cleaned up {len(result)} expired operations")
+            if deleted:
+                logger.info(f"Cleaned up {deleted} expired operations")
         except Exception as e:
             logger.error(f"Failed to cleanup expired operations: {e}")
 
@@ -527,70 +865,93 @@ class BaseRequest:
 
         return self.respond(
             code=code,
-            json_out=json_out,
+            json_out=json_out if isinstance(json_out, dict) else None,
             message=message,
-            headers=headers,
+            headers=headers if isinstance(headers, dict) else None,
             origin="return_error",
         )
 
+    def return_exception(self, e, message: str = None, code: int = None,
+                        json_out: dict = None, headers: dict = None) -> func.HttpResponse:
+        """Return error response with the status code mapped from the exception type"""
+        exc_type = e if isinstance(e, type) else type(e)
+        code = code if code else _exception_status_code(exc_type)
+        message = message if message else f"{exc_type.__name__}: {e}"
+        
+        json_out = json_out if isinstance(json_out, dict) else dict()
+        json_out["error_type"] = exc_type.__name__
+        if not isinstance(e, type):
+            json_out["error"] = str(e)
+
+        return self.return_error(
+            message=message,
+            code=code,
+            json_out=json_out,
+            headers=headers,
+        )
+
     def return_success(self, message: str = None, code: int = 200,
                       json_out: dict = None, headers: dict = None) -> func.HttpResponse:
         """Return success response with message and code"""
         message = message if message else "Success"
-        logger.debug(f"Returning success - message: {message} \n code: {code}")
+        logger.debug("Returning success - message: %s \n code: %s", message, code)
+
+        if message == "Success" and not isinstance(json_out, dict) and not isinstance(headers, dict):
+            response = func.HttpResponse(body=_SUCCESS_BODY, status_code=code, headers=_DEFAULT_JSON_HEADERS)
+            self._last_response = (response, _SUCCESS_JSON)
+            return response
 
         return self.respond(
             code=code,
-            json_out=json_out,
+            json_out=json_out if isinstance(json_out, dict) else None,
             message=message,
-            headers=headers,
+            headers=headers if isinstance(headers, dict) else None,
             origin="return_success",
         )
 
     def respond(self, code: int, json_out: dict = None, message: str = None,
                headers: dict = None, origin: str = None) -> func.HttpResponse:
-        """Create HTTP response"""
-        logger.debug(f"Creating func.HttpResponse for {origin}")
+        """Create HTTP response - expects json_out and headers as dict or None, see return_error/return_success"""
+        logger.debug("Creating func.HttpResponse for %s - message: %s, json_out: %s, error context: %s",
+                     origin, message, json_out is not None, origin == "return_error")
         json_body = dict()
-        logger.flush_logger()
         
-        if isinstance(headers, dict):
-            headers["Content-Type"] = "application/json"
+        if headers:
+            headers = {**headers, **_DEFAULT_JSON_HEADERS}
         else:
-            headers = {"Content-Type": "application/json"}
+            headers = _DEFAULT_JSON_HEADERS
 
-        if isinstance(message, str):
-            logger.debug(f"respond: Adding message to response: {message}")
+        if message:
             json_body["message"] = message
 
-        if isinstance(json_out, dict):
-            logger.debug(f"respond: Adding json_out to response")
+        if json_out is not None:
             json_body["response"] = json_out  
-        
-        logger.flush_logger()
            
         if origin == "return_error":
-            logger.debug(f"respond: Adding error context to response")
-            if isinstance(self.req_json, dict):
+            # req_json only ever comes from the JSON parser, so an exact type check is enough
+            if type(self.req_json) is dict:
                 json_body["request_json"] = self.req_json
-            json_body['error_log'] = log_list.log_messages
+            json_body['error_log'] = self.log_messages[-ERROR_LOG_MAX_MESSAGES:]
         
         try:
-            body = json.dumps(json_body)
-            logger.debug(f"Returning func.HttpResponse for {origin}")
-            logger.flush_logger()
+            body = _dumps(json_body)
+            if len(body) > ERROR_BODY_MAX_BYTES and "error_log" in json_body:
+                logger.warning("Error response exceeds %d bytes, dropping error_log", ERROR_BODY_MAX_BYTES)
+                del json_body["error_log"]
+                body = _dumps(json_body)
         
         except Exception as e:
             error_message = f"Could not create JSON body for response: {e}"
             logger.critical(error_message)
             code = 500
-            body = json.dumps({"message": error_message, "log": log_list.log_messages})
+            json_body = {"message": error_message, "log": self.log_messages[-ERROR_LOG_MAX_MESSAGES:]}
+            body = _dumps(json_body, default=repr)
             
-        return func.HttpResponse(body=body, status_code=code, headers=headers)
-
+        response = func.HttpResponse(body=body, status_code=code, headers=headers)
+        self._last_response = (response, json_body)
+        
+        return response
 
-# Maintain backward compatibility
-#BaseRequest = IdempotentBaseRequest
 
 class OldBaseRequest:
     def __init__(self, req: func.HttpRequest, use_json: bool = True):
@@ -599,6 +960,7 @@ class OldBaseRequest:
         self.response = None
         self.env_dict = None
         self.content_type = None
+        self._is_json_ct = False
         self.req_json = None
         self.req = req
         
@@ -618,7 +980,7 @@ class OldBaseRequest:
             self.content_type = self.req.headers.get(
                 "Content-Type"
             )  # look for application/json in headers
-            logger.debug(f"Content-Type: {self.content_type}")
+            logger.debug("Content-Type: %s", self.content_type)
             
         except Exception as e:  # if headers are invalid, return error response
             self.content_type = None
@@ -628,11 +990,14 @@ class OldBaseRequest:
             
             self.response = self.return_error(message_out)
             
-        if self.content_type and "application/json" in self.content_type:
+        self._is_json_ct = _ct_is_json(self.content_type)
+        if self._is_json_ct:
             logger.debug("application/json found, parsing JSON")
             try:
-                self.req_json = self.req.get_json()
-                logger.debug(f"JSON: {self.req_json}")
+                raw = self.req.get_body()
+                self.req_json = _loads(raw) if raw else None
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("JSON: %s", self.req_json)
 
                 logger.info("BaseRequest initialized")
             except Exception as e:
@@ -656,16 +1021,14 @@ class OldBaseRequest:
         # Check the operating system
         try:
             self.env_dict = {
-                "os_name": os.name,
+                **_STATIC_ENV,
                 "current_working_directory": os.getcwd(),
-                "environment_variables": os.environ,
-                "cpu_count": os.cpu_count(),
-                "platform_system": platform.system(),
-                "platform_release": platform.release(),
-                "python_version": sys.version,
-                "python_version_info": sys.version_info
+                "environment_variables": {
+                    k: os.environ[k] for k in ENVIRONMENT_ALLOWLIST if k in os.environ
+                },
             }
-            logger.debug(f"Environment: {self.env_dict} ")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Environment: %s ", self.env_dict)
         except Exception as e:
             logger.warning(f"Error: could not get environment info {e}")
             self.env_dict = None
@@ -1,9 +1,80 @@
 import azure.functions as func
+import re
+import threading
+import time
+
 from enterprise_api import ImageServer, EnterpriseClient, MapServer
-from .base_request import BaseRequest
+from .base_request import BaseRequest, RecentResults, _DEFAULT_JSON_HEADERS
 from utils import *
 
+# printable ASCII without space, quote or backslash - embeds in JSON without escaping
+_JSON_SAFE_URL = re.compile(r'[!#-\[\]-~]+')
+# separators between service type names in a serviceTypes string
+_SERVICE_TYPE_SEPARATORS = re.compile(r'[^a-z0-9]+')
+
+# vault-backed clients by (class, from_vault kwargs) with build time, rebuilt after PORTAL_CLIENT_CACHE_SECONDS
+_CLIENT_CACHE = dict()
+_CLIENT_CACHE_LOCK = threading.Lock()
+
+def _cached_client(cls, **kwargs):
+    key = (cls, tuple(sorted(kwargs.items())))
+    cached = _CLIENT_CACHE.get(key)
+    if cached and time.monotonic() - cached[1] < PORTAL_CLIENT_CACHE_SECONDS:
+        return cached[0]
+
+    with _CLIENT_CACHE_LOCK:
+        cached = _CLIENT_CACHE.get(key)
+        if cached and time.monotonic() - cached[1] < PORTAL_CLIENT_CACHE_SECONDS:
+            return cached[0]
+        client = cls.from_vault(**kwargs)
+        _CLIENT_CACHE[key] = (client, time.monotonic())
+
+    return client
+
+
+# successful publish_image_service results by input, so retried publishes skip the Enterprise calls
+_PUBLISH_RESULTS = RecentResults(ttl=PUBLISH_RESULT_CACHE_SECONDS)
+
+
 class EnterpriseRequest(BaseRequest):
+
+    # command: (method name, keyword arguments) for enterprise_api_response
+    _COMMANDS = {
+        'publish_raster': ('publish_image_service', {}),
+        'publish_raster_collection': ('publish_image_service', {'collection': True}),
+        'publish_vectors': ('sync_map_server', {}),
+        'enable_wfs': ('enable_wfs', {}),
+        'enable_wcs': ('enable_wcs_req', {}),
+        'register_table': ('register_table', {}),
+        'share_all': ('share_all', {}),
+        'list_services': ('list_services', {}),
+        'query_datastore_status': ('query_datastore_status', {}),
+    }
+
+    # (attribute, request json key, default) set from the request in __init__
+    _FIELDS = (
+        ('cloudstore_id', 'cloudstoreID', DEFAULT_CLOUDSTORE_ID),
+        ('container_folder_name', 'containerFolderName', None),
+        ('container_name', 'containerName', DEFAULT_HOSTING_CONTAINER),
+        ('context_name', 'contextName', None),
+        ('datastore_id', 'datastoreId', DEFAULT_DATASTORE_ID),
+        ('db_user', 'dbUser', DEFAULT_DB_USER),
+        ('raster_collection', 'rasterCollection', None),
+        ('raster_name', 'rasterName', None),
+        ('schema_name', 'schemaName', DEFAULT_DB_USER),
+        ('server_folder_name', 'serverFolderName', None),
+        ('service_name', 'serviceName', None),
+        ('service_types', 'serviceTypes', None),
+        ('server_folder', 'serverFolder', DEFAULT_DATASTORE_SERVER_FOLDER),
+        ('sync_metadata', 'syncMetadata', True),
+        ('wait_on_async', 'waitForAsync', True),
+        ('table_name', 'tableName', None),
+        ('time_index', 'timeIndex', None),
+    )
+
+    # supported rasterCollection string delimiters, exactly one may be used
+    _COLLECTION_DELIMITERS = frozenset(',;| ')
+
     def __init__(self, req: func.HttpRequest,
                  command: str = None,
                  params: dict = None):
@@ -11,86 +82,54 @@ class EnterpriseRequest(BaseRequest):
         logger.info('Initializing EnterpriseRequest')
         super().__init__(req, use_json=True)
         self.params = params if params else {}
-        self.cloudstore_id = None
-        self.container_folder_name = None
-        self.container_name = None
-        self.context_name = None
-        self.datastore_id = None
-        self.db_user = None
-        self.raster_collection = None
-        self.raster_name = None
-        self.schema_name = None
-        self.server_folder_name = None
-        self.service_name = None
-        self.service_types = None
-        self.table_name = None
-        self.time_index = None
-
-        params_defaults = {
-            'cloudstoreID': {'var': 'cloudstore_id', 'default': DEFAULT_CLOUDSTORE_ID},
-            'containerFolderName': {'var': 'container_folder_name', 'default': None},
-            'containerName': {'var': 'container_name', 'default': DEFAULT_HOSTING_CONTAINER},
-            'contextName': {'var': 'context_name', 'default': None},
-            'datastoreId': {'var': 'datastore_id', 'default': DEFAULT_DATASTORE_ID},
-            'dbUser': {'var': 'db_user', 'default': DEFAULT_DB_USER},
-            'rasterCollection': {'var': 'raster_collection', 'default': None},
-            'rasterName': {'var': 'raster_name', 'default': None},
-            'schemaName': {'var': 'schema_name', 'default': DEFAULT_DB_USER},
-            'serverFolderName': {'var': 'server_folder_name', 'default': None},
-            'serviceName': {'var': 'service_name', 'default': None},
-            'serviceTypes': {'var': 'service_types', 'default': None},
-            'tableName': {'var': 'table_name', 'default': None},
-            'timeIndex': {'var': 'time_index', 'default': None}
-        }
-
-        for key, value in params_defaults.items():
-            logger.debug(f'Checking for {key} in request')
-            
-            if key in self.req_json:
-                logger.debug(f'Found {key} in request, setting {value["var"]} to {self.req_json.get(key)}')
-                setattr(self, value['var'], self.req_json.get(key))
-            else:
-                logger.debug(
-                    f'{key} not found in request, setting {value["var"]} to default {value["default"]}')
-                setattr(self, value['var'], value['default'])
+        if self.response is not None:
+            # request content was rejected, self.response already holds the error
+            return
+
+        if command not in self._COMMANDS:
+            self.response = self.return_error(f'Unknown hosting command: {command}')
+            return
+        
+        get = (self.req_json or {}).get
+        for attr, key, default in self._FIELDS:
+            setattr(self, attr, get(key, default))
+
+        # lower-cased service type names for membership tests
+        service_types = self.service_types
+        if not service_types:
+            self._service_types_lc = frozenset()
+        elif isinstance(service_types, str):
+            self._service_types_lc = frozenset(_SERVICE_TYPE_SEPARATORS.split(service_types.lower()))
+        else:
+            self._service_types_lc = frozenset(s.lower() for s in service_types)
         
-        logger.debug(f'EnterpriseRequest initialized with command {command} request: {self.req_json}')
+        logger.debug('EnterpriseRequest initialized with command %s request: %s', command, self.req_json)
         
         self.response = self.enterprise_api_response(command=command)
     
     def enterprise_api_response(self,command:str=None) -> func.HttpResponse:
-        logger.debug(f'Handling hosting command: {command}')
+        logger.debug('Handling hosting command: %s', command)
 
-        if command == 'publish_raster':
-            return self.publish_image_service()
+        # unknown commands are rejected in __init__ before any request state is set up
+        method_name, kwargs = self._COMMANDS[command]
         
-        elif command == 'publish_raster_collection':
-            return self.publish_image_service(collection=True)
+        return getattr(self, method_name)(**kwargs)
         
-        elif command == 'publish_vectors':
-            return self.sync_map_server()
+    def _url_success(self, message_prefix: str, key: str, url) -> func.HttpResponse:
+        # single-URL success responses are assembled as bytes when the url needs no escaping,
+        # matching what return_success would serialize
+        if not (isinstance(url, str) and _JSON_SAFE_URL.fullmatch(url)):
+            return self.return_success(message=f'{message_prefix}{url}', json_out={key: url})
         
-        elif command == 'enable_wfs':
-            return self.enable_wfs()
-        
-        elif command == 'enable_wcs':
-            return self.enable_wcs_req()
-        
-        elif command == 'register_table':
-            return self.register_table()
-        
-        elif command == 'share_all':
-            return self.share_all()
-        
-        elif command == 'list_services':
-            return self.list_services()
-        
-        elif command == 'query_datastore_status':
-            return self.query_datastore_status()
-        
-        else:
-            return self.return_error(f'Unknown hosting command: {command}')
+        url_bytes = url.encode()
+        body = b''.join((
+            b'{"message":"', message_prefix.encode(), url_bytes,
+            b'","response":{"', key.encode(), b'":"', url_bytes, b'"}}'))
+        response = func.HttpResponse(body=body, status_code=200, headers=_DEFAULT_JSON_HEADERS)
+        self._last_response = (response, {'message': f'{message_prefix}{url}', 'response': {key: url}})
         
+        return response
+
     def publish_image_service(self,collection=False):
         
         logger.debug('Publishing image service')
@@ -107,7 +146,7 @@ class EnterpriseRequest(BaseRequest):
 
             
         if not self.context_name:
-            logger.debug(f'contextName missing from request, defaulting to {DEFAULT_IMAGERY_CONTEXT_NAME}')
+            logger.debug('contextName missing from request, defaulting to %s', DEFAULT_IMAGERY_CONTEXT_NAME)
             self.context_name = DEFAULT_IMAGERY_CONTEXT_NAME
         
         if collection:
@@ -143,10 +182,36 @@ class EnterpriseRequest(BaseRequest):
                 
                 return self.return_error(error_message)
             
+        publish_key = (
+            collection,
+            self.service_name,
+            tuple(map(str, self.raster_collection)) if collection else str(self.raster_name),
+            self.cloudstore_id,
+            self.context_name,
+            self.server_folder_name,
+            self._service_types_lc,
+        )
+        # concurrent duplicates wait for the first publish instead of republishing the service
+        try:
+            with _PUBLISH_RESULTS.single_flight(publish_key, PUBLISH_INFLIGHT_WAIT_SECONDS) as cached:
+                if cached:
+                    logger.info('Returning recent publish result for service %s', self.service_name)
+                    message, response = cached
+                    return self.return_success(message=message, json_out=response)
+
+                return self._publish_image_service(collection, publish_key)
+        except TimeoutError as e:
+            error_message = f'Publish of service {self.service_name} already in progress: {e}'
+            logger.warning(error_message)
+            return self.return_error(error_message, code=409)
+
+    def _publish_image_service(self, collection: bool, publish_key: tuple):
+        error_message = None
+
         try:
             logger.debug('Instantiating ImageServer')
             #logger.debug(f'Using vault {self.vault_name} and context {self.context_name}')
-            R = ImageServer.from_vault()
+            R = _cached_client(ImageServer)
         except Exception as e:
             error_message = f'Could not instantiate ImageServer: {e}'
             logger.error(error_message)
@@ -182,18 +247,10 @@ class EnterpriseRequest(BaseRequest):
         #ping service URL to test
 
 
-        if self.service_types:
-            if isinstance(self.service_types, list) and 'wcs' in [s.lower() for s in self.service_types]:
-                publish_wcs = True
-            elif isinstance(self.service_types, str) and 'wcs' in self.service_types.lower():
-                publish_wcs = True
-            else:
-                publish_wcs = False
-        else:
-            publish_wcs = False
-        
-        if publish_wcs: 
+        if 'wcs' in self._service_types_lc: 
             logger.debug('Enabling WCS')
+            self.wcs_url = None
+            error_message = None
             try:
                 self.wcs_url = R.enable_wcs(
                     service_name=self.service_name,
@@ -210,7 +267,10 @@ class EnterpriseRequest(BaseRequest):
                 message += f'WARNING Error enabling WCS: {error_message}'
                 response['wcsUrl'] = 'error'
         else:
-            logger.debug(f'WCS not enabled: no wcs in service types: {self.service_types}')
+            logger.debug('WCS not enabled: no wcs in service types: %s', self.service_types)
+
+        if response.get('wcsUrl') != 'error':
+            _PUBLISH_RESULTS.put(publish_key, (message, response))
             
         return self.return_success(message=message, json_out=response)
 
@@ -219,7 +279,7 @@ class EnterpriseRequest(BaseRequest):
         logger.debug('Enabling WCS')
         
         try:
-            R = ImageServer.from_vault()
+            R = _cached_client(ImageServer)
         except Exception as e:
             return self.return_error(f'Could not instantiate ImageServer: {e}')
         
@@ -231,35 +291,31 @@ class EnterpriseRequest(BaseRequest):
         except Exception as e:
             return self.return_error(f'Error during enable_wcs: {e}')
         
-        return self.return_success(message=f'WCS enabled: {result}',json_out={'wcsUrl':result})
+        return self._url_success('WCS enabled: ', 'wcsUrl', result)
     
     
     def query_datastore_status(self):
         
-        logger.debug(f'Querying datastore {self.datastore_id}')
+        logger.debug('Querying datastore %s', self.datastore_id)
         if not self.datastore_id:
-            logger.warning(f'Instance datastore_id missing - attempting to retrieve from {self.req_json}')
-            if not self.req_json.get('datastoreId', None):
-                error_message = f'datastoreId missing from request, attempting to use default {DEFAULT_DATASTORE_ID}'
-                logger.warning(error_message)
-                self.datastore_id = DEFAULT_DATASTORE_ID
-
-            else:
-                self.datastore_id = self.req_json.get('datastoreId', None)
+            # datastoreId was already read from the request in __init__
+            error_message = f'datastoreId missing from request, attempting to use default {DEFAULT_DATASTORE_ID}'
+            logger.warning(error_message)
+            self.datastore_id = DEFAULT_DATASTORE_ID
         try:
             logger.debug('Instantiating Enterprise API Client')
-            E = EnterpriseClient.from_vault()
+            E = _cached_client(EnterpriseClient)
         except Exception as e:
             return self.return_error(f'Error instantiating Enterprise API Client: {e}')
         
-        logger.debug(f'Checking if datastore {self.datastore_id} exists')
+        logger.debug('Checking if datastore %s exists', self.datastore_id)
         try:
            datastore_exists = E.item_exists(item_id=self.datastore_id)
         except Exception as e:
             return self.return_error(f'Error searching for datastore: {e}')
         
         if datastore_exists:
-            logger.debug(f'Datastore {self.datastore_id} exists, querying status')
+            logger.debug('Datastore %s exists, querying status', self.datastore_id)
         else:
             return self.return_error(f'Datastore {self.datastore_id} could not be found')
 
@@ -281,7 +337,7 @@ class EnterpriseRequest(BaseRequest):
         if not service_types:
             service_types = self.service_types
         try:
-            E = EnterpriseClient.from_vault()
+            E = _cached_client(EnterpriseClient)
         except Exception as e:
             return self.return_error(f'Error instantiating Enterprise API Client: {e}')
         try:
@@ -298,7 +354,7 @@ class EnterpriseRequest(BaseRequest):
     def register_table(self):
         logger.debug('Registering table')
         try:
-            H = EnterpriseClient.from_vault()
+            H = _cached_client(EnterpriseClient)
             response = H.register_table(
                 table_name=self.table_name)
                 #schema_name=self.req_json.get('schemaName', None))
@@ -316,11 +372,8 @@ class EnterpriseRequest(BaseRequest):
         else:
             datastore_id = self.datastore_id 
 
-        sync_metadata = self.req_json.get('syncMetadata',True)
-        wait_on_asynch = self.req_json.get('waitForAsync',True)
-        
         try:
-            M = MapServer.from_vault(datastore_id=datastore_id,context_name=self.context_name,)
+            M = _cached_client(MapServer, datastore_id=datastore_id, context_name=self.context_name)
         except Exception as e:
             return self.return_error(f'Could not instantiate MapServer: {e}')
         
@@ -332,10 +385,10 @@ class EnterpriseRequest(BaseRequest):
             return self.return_error(f'Datastore {datastore_id} does not exist')
         
         try:
-            logger.debug(f'Synchronizing MapServer for datastore {datastore_id}')
+            logger.debug('Synchronizing MapServer for datastore %s', datastore_id)
             M.synchronize_datastore_layers(
                 datastore_id=datastore_id,
-                sync_metadata=sync_metadata)
+                sync_metadata=self.sync_metadata)
         except Exception as e:
             return self.return_error(f'Error during sychronize: {e}')
         
@@ -344,30 +397,28 @@ class EnterpriseRequest(BaseRequest):
     def enable_wfs(self):
         logger.debug('Enabling WFS')
 
-        context_name = self.req_json.get('contextName',DEFAULT_VECTOR_CONTEXT_NAME)
-        server_folder = self.req_json.get('serverFolder',DEFAULT_DATASTORE_SERVER_FOLDER)
-        service_name = self.req_json.get('serviceName',None)
+        context_name = self.context_name if self.context_name else DEFAULT_VECTOR_CONTEXT_NAME
 
         try:
-            M = MapServer.from_vault()
+            M = _cached_client(MapServer)
         except Exception as e:
             return self.return_error(f'Could not instantiate MapServer: {e}')
         
         try:
             wfs_url = M.enable_wfs(
                 service_name=self.service_name,
-                server_folder=server_folder,
+                server_folder=self.server_folder,
                 context_name=context_name)
         except Exception as e:
             return self.return_error(f'Error during enable_wfs: {e}')
         
-        return self.return_success(message=f'WFS enabled: {wfs_url}',json_out={'wfsUrl':wfs_url})
+        return self._url_success('WFS enabled: ', 'wfsUrl', wfs_url)
 
     def share_all(self):
         logger.debug('Sharing all services')
         
         try:
-            M = MapServer.from_vault()
+            M = _cached_client(MapServer)
         except Exception as e:
             return self.return_error(f'Could not instantiate MapServer: {e}')
         
@@ -381,30 +432,27 @@ class EnterpriseRequest(BaseRequest):
     def _parse_raster_collection(self,raster_collection=None):
         raster_collection = raster_collection if raster_collection else self.raster_collection
         
-        logger.debug(f'Parsing raster collection {raster_collection}')
+        logger.debug('Parsing raster collection %s', raster_collection)
 
-        split_by = list()
-        for delimiter in [',',';','|',' ']:
-            if delimiter in self.raster_collection:
-                logger.debug(f'Found delimiter {delimiter} in rasterCollection string')
-                split_by.append(delimiter)
+        split_by = self._COLLECTION_DELIMITERS.intersection(raster_collection)
                     
         if len(split_by) > 1:
-            error_message = f'Invalid rasterCollection string: {self.raster_collection} - multiple delimiters found: {split_by}'
+            error_message = f'Invalid rasterCollection string: {raster_collection} - multiple delimiters found: {sorted(split_by)}'
             logger.error(error_message)
                 
             raise ValueError(error_message)
             
         if len(split_by) == 1:
-            logger.debug(f'Splitting rasterCollection string by {split_by[0]}')
+            delimiter = split_by.pop()
+            logger.debug('Splitting rasterCollection string by %s', delimiter)
                 
-            raster_collection = [r.strip() for r in raster_collection.split(split_by[0])]
-            logger.info(f'Parsed rasterCollection: {self.raster_collection}')
+            raster_collection = [r.strip() for r in raster_collection.split(delimiter)]
+            logger.info('Parsed rasterCollection: %s', raster_collection)
             
             return raster_collection
             
         else:
-            error_message = f'Could not parse rasterCollection string: {self.raster_collection} - no delimiters found. Supported delimiters are "," ";" "|" " "'
+            error_message = f'Could not parse rasterCollection string: {raster_collection} - no delimiters found. Supported delimiters are "," ";" "|" " "'
             logger.error(error_message)
             
             raise ValueError(error_message)
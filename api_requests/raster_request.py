@@ -1,10 +1,14 @@
 import azure.functions as func
+import logging
 #from datetime import datetime
 
-from .base_request import BaseRequest
-from api_clients import RasterHandler
+from .base_request import BaseRequest, RecentResults
+import api_clients
 from utils import *
 
+# successful stage results by input, reused for overwrite=False requests so retries skip the copy
+_STAGE_RESULTS = RecentResults(ttl=STAGE_RESULT_CACHE_SECONDS)
+
 
 class RasterRequest(BaseRequest):
 
@@ -14,36 +18,40 @@ class RasterRequest(BaseRequest):
         logger.info('Initializing RasterRequest')
         super().__init__(req)
         error_message = None
-                
+        if self.response is not None:
+            # request content was rejected, self.response already holds the error
+            return
+
+        if command != 'stage':
+            self.response = self.return_error(f'Invalid RasterRequest command: {command}')
+            return
 
-        self.raster_name = self.req_json.get('rasterName',None)
+        get = (self.req_json or {}).get
+        self.raster_name = get('rasterName',None)
 
-        self.epsg_code = self.req_json.get('EPSGCode', DEFAULT_EPSG_CODE)
-        self.input_epsg_code = self.req_json.get('inputEPSGCode', None)
-        self.cloud_optimize = self.req_json.get('COG', True)
-        self.container_name = self.req_json.get('containerName', DEFAULT_WORKSPACE_CONTAINER)
-        self.output_container_name = self.req_json.get('outputContainerName', DEFAULT_HOSTING_CONTAINER)
-        self.raster_name_out = self.req_json.get('rasterNameOut', None)
-        self.overwrite = self.req_json.get('overwrite', False)
+        self.epsg_code = get('EPSGCode', DEFAULT_EPSG_CODE)
+        self.input_epsg_code = get('inputEPSGCode', None)
+        self.cloud_optimize = get('COG', True)
+        self.container_name = get('containerName', DEFAULT_WORKSPACE_CONTAINER)
+        self.output_container_name = get('outputContainerName', DEFAULT_HOSTING_CONTAINER)
+        self.raster_name_out = get('rasterNameOut', None)
+        self.overwrite = get('overwrite', False)
         
-        logger.debug(f'Raster name: {self.raster_name}')
-        logger.debug(f'Raster name type: {type(self.raster_name)}')
-        logger.debug(f'EPSG code: {self.epsg_code}')
-        logger.debug(f'Cloud optimized: {self.cloud_optimize}')
-        logger.debug(f'Container name: {self.container_name}')
-        logger.debug(f'Output container name: {self.output_container_name}')
-        logger.debug(f'Raster name out: {self.raster_name_out}')
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('Raster name: %s', self.raster_name)
+            logger.debug('Raster name type: %s', type(self.raster_name))
+            logger.debug('EPSG code: %s', self.epsg_code)
+            logger.debug('Cloud optimized: %s', self.cloud_optimize)
+            logger.debug('Container name: %s', self.container_name)
+            logger.debug('Output container name: %s', self.output_container_name)
+            logger.debug('Raster name out: %s', self.raster_name_out)
         
         if isinstance(self.raster_name,str):
-            logger.debug(f'String found: <{self.raster_name}> validating as single raster')
+            logger.debug('String found: <%s> validating as single raster', self.raster_name)
             try:
-                if RasterHandler.valid_raster_name(self.raster_name):
-                    logger.debug(f'Staging single raster: {self.raster_name}')
+                if api_clients.RasterHandler.valid_raster_name(self.raster_name):
+                    logger.debug('Staging single raster: %s', self.raster_name)
                         
-                elif ';' in raster_names:
-                    logger.debug(f'Semicolon separated list found: {self.raster_name}')
-                    raster_names = raster_names.split(';')
-
                 else:
                     error_message = (f'Stage Raster failed: invalid raster name: {self.raster_name}')
                     logger.critical(error_message)
@@ -54,36 +62,50 @@ class RasterRequest(BaseRequest):
                 logger.critical(error_message)
                 command = 'fail'
                 
-        elif command == 'stage':
+        else:
             error_message = 'Staging raster failed: no raster name provided'
             logger.critical(error_message)
             command = 'fail'
 
-        try:
-            if RasterHandler.is_valid_epsg_code(self.epsg_code):
-                logger.info(f'Output CRS: {RasterHandler.CRS_from_epsg(self.epsg_code)}')
-            else:
-                logger.warning(f'Invalid output CRS provided - defaulting to WGS84')
-                self.epsg_code = DEFAULT_EPSG_CODE 
-        except Exception as e:
-            logger.error(f'Error validating EPSG code: {e}')
-            self.epsg_code = DEFAULT_EPSG_CODE
+        if command != 'fail':
+            try:
+                if api_clients.RasterHandler.is_valid_epsg_code(self.epsg_code):
+                    logger.info('Output CRS: %s', api_clients.RasterHandler.CRS_from_epsg(self.epsg_code))
+                else:
+                    logger.warning(f'Invalid output CRS provided - defaulting to WGS84')
+                    self.epsg_code = DEFAULT_EPSG_CODE 
+            except Exception as e:
+                logger.error(f'Error validating EPSG code: {e}')
+                self.epsg_code = DEFAULT_EPSG_CODE
             
         if command == 'stage':
             self.response = self._stage()
         
-        elif command == 'fail':
+        else:
             error_message = error_message if error_message else 'Uknown RasterHandler Error'
             self.response = self.return_error(error_message)
 
-        else:
-            self.response = self.return_error(f'Invalid RasterRequest command: {command}')
-
     def _stage(self):
         logger.debug('Handling stage raster request')
 
+        # values come straight from the request body, stringified so a list or dict stays hashable
+        stage_key = tuple(map(str, (
+            self.raster_name,
+            self.raster_name_out,
+            self.container_name,
+            self.output_container_name,
+            self.epsg_code,
+            self.input_epsg_code,
+            self.cloud_optimize,
+        )))
+        cached = None if self.overwrite else _STAGE_RESULTS.get(stage_key)
+        if cached:
+            logger.info('Returning recent stage result for raster %s', self.raster_name)
+            message, result = cached
+            return self.return_success(message=message, json_out=result)
+
         try:#initialize RasterHandler
-            R = RasterHandler(
+            R = api_clients.RasterHandler(
                 workspace_container_name=self.container_name,
                 output_container_name=self.output_container_name,
                 epsg_code=self.epsg_code,
@@ -97,7 +119,7 @@ class RasterRequest(BaseRequest):
             return self.return_error(error_message)
         
         if self.raster_name and isinstance(self.raster_name,str):
-            logger.debug(f'Staging single raster: {self.raster_name} from container {self.container_name}')
+            logger.debug('Staging single raster: %s from container %s', self.raster_name, self.container_name)
             try:
                 result = R.stage_raster_file(
                     raster_name_in=self.raster_name,
@@ -111,6 +133,8 @@ class RasterRequest(BaseRequest):
                 
                 message = f'Raster {result["raster_name_in"]} staged as {result["raster_name_out"]} in container {result["output_container_name"]}'
                 logger.info(message)
+                if not self.overwrite:
+                    _STAGE_RESULTS.put(stage_key, (message, result))
                 
                 return self.return_success(
                     message=message,
@@ -128,9 +152,9 @@ class RasterRequest(BaseRequest):
     def validate_raster_name(self,raster_name:str):
         
         if raster_name and isinstance(raster_name,str):
-            logger.debug(f'Staging single raster: {raster_name} from container {self.container_name}')
+            logger.debug('Staging single raster: %s from container %s', raster_name, self.container_name)
             try:
-                result = RasterHandler.valid_raster_name(raster_name)
+                result = api_clients.RasterHandler.valid_raster_name(raster_name)
                 return result
             
             except Exception as e:
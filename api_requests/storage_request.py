@@ -1,4 +1,5 @@
 import azure.functions as func
+from concurrent.futures import ThreadPoolExecutor
 
 from api_clients import StorageHandler
 from .base_request import BaseRequest
@@ -33,6 +34,10 @@ class StorageRequest(BaseRequest):
             
             return self.return_error(f"StorageRequest Error: request json not found")
 
+        if command == "copy" and isinstance(self.req_json.get("objectNamesIn"), list):
+
+            return self._copy_many()
+
         if command == "copy":
 
             if not self.req_json.get("objectNameIn"):
@@ -43,7 +48,7 @@ class StorageRequest(BaseRequest):
             input_container = self.req_json.get("inputContainer", self.default_container)
             object_name_out = self.req_json.get("objectNameOut", object_name_in)
             output_container = self.req_json.get("outputContainer", self.default_target_container)
-            wait = self.req_json.get("wait", True)
+            wait = self.req_json.get("wait", False)
             overwrite = self.req_json.get("overwrite", False)
             
             try:
@@ -95,6 +100,34 @@ class StorageRequest(BaseRequest):
             else:
                 return self.return_error(f"Unknown error during copy operation")
 
+        elif command == "copy_status":
+
+            if not self.req_json.get("objectNameOut"):
+
+                return self.return_error("Error: objectNameOut missing from request")
+
+            object_name_out = self.req_json.get("objectNameOut")
+            output_container = self.req_json.get("outputContainer", self.default_target_container)
+
+            try:
+                storage = StorageHandler(workspace_container_name=output_container)
+                copy_status = storage.check_copy_status(
+                    container_name=output_container, blob_name=object_name_out
+                )
+
+                return self.return_success(
+                    message=f"Copy status for {object_name_out} in {output_container}: {copy_status}",
+                    json_out={
+                        "copy_status": copy_status,
+                        "object_name_out": object_name_out,
+                        "output_container": output_container,
+                    },
+                )
+
+            except Exception as e:
+
+                return self.return_error(f"Could not get copy status for {object_name_out}: {e}")
+
         elif command == "list_containers":
             try:
                 storage = StorageHandler()
@@ -132,3 +165,48 @@ class StorageRequest(BaseRequest):
                 )
         else:
             return self.return_error(f"Unknown storage command: {command}")
+
+    def _copy_many(self) -> func.HttpResponse:
+        # objectNamesIn copies keep their names, copies are started concurrently and not awaited
+        object_names_in = self.req_json.get("objectNamesIn")
+        input_container = self.req_json.get("inputContainer", self.default_container)
+        output_container = self.req_json.get("outputContainer", self.default_target_container)
+        overwrite = self.req_json.get("overwrite", False)
+
+        if not object_names_in or not all(isinstance(n, str) and n for n in object_names_in):
+            return self.return_error("Error: objectNamesIn must be a non-empty list of blob names")
+
+        try:
+            storage = StorageHandler(workspace_container_name=input_container)
+        except Exception as e:
+            return self.return_error(
+                f"Error: could not instantiate storage handler: {e}"
+            )
+
+        def start_copy(object_name):
+            try:
+                copy_result = storage.copy_blob(
+                    source_blob_name=object_name,
+                    source_container_name=input_container,
+                    dest_blob_name=object_name,
+                    dest_container_name=output_container,
+                    wait_on_status=False,
+                    overwrite=overwrite,
+                )
+                return {"object_name": object_name, "copy_result": copy_result}
+            except Exception as e:
+                logger.error(f"Error starting copy of {object_name}: {e}")
+                return {"object_name": object_name, "error": str(e)}
+
+        logger.debug("Starting %d copies from %s to %s", len(object_names_in), input_container, output_container)
+        with ThreadPoolExecutor(max_workers=min(COPY_MAX_CONCURRENCY, len(object_names_in))) as executor:
+            results = list(executor.map(start_copy, object_names_in))
+
+        failed = sum(1 for r in results if "error" in r)
+        if failed == len(results):
+            return self.return_error(f"Error during copy operation: all {failed} copies failed")
+
+        return self.return_success(
+            message=f"Copy operations started for {len(results) - failed} of {len(results)} blobs from {input_container} to {output_container}",
+            json_out={"copy_results": results, "output_container": output_container},
+        )
@@ -50,11 +50,13 @@ class UploadRequest(BaseRequest):
             f'Uploading file: {file_name} to container: {container}')  
         
         try:
+            # the raw stream lets the SDK read blocks without copying the upload
             result = storage.upload_blob_data(
-                blob_data=file_data,
+                blob_data=file_data.stream,
                 dest_blob_name=file_name,
                 container_name=container,
-                overwrite=True
+                overwrite=True,
+                length=file_data.content_length or None,
                 )            
         except Exception as e:
             message = f'Unhandled error during file upload: {e}'
@@ -11,64 +11,43 @@ from utils import *
 
 class VectorRequest(BaseRequest):
 
+    # (attribute, request json key, default) set from the request in __init__
+    _FIELDS = (
+        ("append", "append", False),
+        ("attribute_index", "attributeIndex", None),
+        ("batch_size", "batchSize", None),
+        ("column_dict", "columnDict", None),
+        ("workspace_container_name", "containerName", DEFAULT_WORKSPACE_CONTAINER),
+        ("db_user", "dbUser", DEFAULT_DB_USER),
+        ("epsg_code", "epsgCode", DEFAULT_EPSG_CODE),
+        ("file_name", "fileName", None),
+        ("file_type", "fileType", None),
+        ("geometry_name", "geometryName", "shape"),
+        ("geometry_type", "geometryType", None),
+        ("lat_attr_name", "latName", None),
+        ("layer_name", "layerName", None),
+        ("lon_attr_name", "lonName", None),
+        ("multiprocessing", "multiprocessing", False),
+        ("overwrite", "overwrite", False),
+        ("schema_name", "schemaName", DEFAULT_DB_USER),
+        ("table_name", "tableName", None),
+        ("time_index", "timeIndex", None),
+        ("wkt_column", "WKTColumn", None),
+    )
+
     def __init__(self, req: func.HttpRequest, command: str = None):
 
         logger.info("Initializing VectorRequest")
         super().__init__(req)
-        self.append = None
-        self.attribute_index = None
-        self.batch_size = None
-        self.column_dict = None
-        self.db_user = None
-        self.epsg_code = None
-        self.file_name = None
-        self.file_type = None
-        self.geometry_name = None
         self.if_exists = None
         self.indices_to_add = None
-        self.lat_attr_name = None
-        self.layer_name = None
-        self.lon_attr_name = None
-        self.multiprocessing = None
-        self.overwrite = None
-        self.schema_name = None
-        self.table_name = None
-        self.time_index = None
         self.time_indices_to_add = None
-        self.wkt_column = None
-
-        self.workspace_container_name = None
 
         error_message = None
 
-        params_defaults = {
-            "append": {"var": "append", "default": False},
-            "attributeIndex": {"var": "attribute_index", "default": None},
-            "batchSize": {"var": "batch_size", "default": None},
-            "columnDict": {"var": "column_dict", "default": None},
-            "containerName": {
-                "var": "workspace_container_name",
-                "default": DEFAULT_WORKSPACE_CONTAINER,
-            },
-            "dbUser": {"var": "db_user", "default": DEFAULT_DB_USER},
-            "epsgCode": {"var": "epsg_code", "default": DEFAULT_EPSG_CODE},
-            "fileName": {"var": "file_name", "default": None},
-            "fileType": {"var": "file_type", "default": None},
-            "geometryName": {"var": "geometry_name", "default": "shape"},
-            "geometryType": {"var": "geometry_type", "default": None},
-            "latName": {"var": "lat_attr_name", "default": None},
-            "layerName": {"var": "layer_name", "default": None},
-            "lonName": {"var": "lon_attr_name", "default": None},
-            "multiprocessing": {"var": "multiprocessing", "default": False},
-            "overwrite": {"var": "overwrite", "default": False},
-            "schemaName": {"var": "schema_name", "default": DEFAULT_DB_USER},
-            "tableName": {"var": "table_name", "default": None},
-            "timeIndex": {"var": "time_index", "default": None},
-            "WKTColumn": {"var": "wkt_column", "default": None},
-        }
-
-        for key, value in params_defaults.items():
-            setattr(self, value["var"], self.req_json.get(key, value["default"]))
+        get = (self.req_json or {}).get
+        for attr, key, default in self._FIELDS:
+            setattr(self, attr, get(key, default))
 
         if self.overwrite and self.append:
             command = 'return_error'
@@ -241,7 +220,8 @@ class VectorRequest(BaseRequest):
 
         try:
             logger.debug(
-                f"Instantiating VectorHandler with blob file: {self.file_name} in container: {self.workspace_container_name}"
+                "Instantiating VectorHandler with blob file: %s in container: %s",
+                self.file_name, self.workspace_container_name
             )
 
             vector_gdf = VectorLoader.from_blob_file(
@@ -261,7 +241,7 @@ class VectorRequest(BaseRequest):
             return self.return_exception(e, message=error_message)
 
         try:
-            logger.debug(f"Creating VectorHandler instance from GeoDataFrame")
+            logger.debug("Creating VectorHandler instance from GeoDataFrame")
             vector = VectorHandler.from_gdf(
                 gdf=vector_gdf,
                 geometry_name=self.geometry_name,
@@ -274,7 +254,7 @@ class VectorRequest(BaseRequest):
             return self.return_exception(e, message=error_message)
 
         try:
-            logger.debug(f"Preparing GeoDataFrame for database")
+            logger.debug("Preparing GeoDataFrame for database")
             vector.prepare_gdf(
                 epsg_code=self.epsg_code,
                 geometry_name=self.geometry_name,
@@ -292,7 +272,7 @@ class VectorRequest(BaseRequest):
             return self.return_exception(e, message=error_message)
 
         try:
-            logger.debug(f"Initiating database upload")
+            logger.debug("Initiating database upload")
             vpg = EnterprisePostGIS.from_valid_gdf(
                 gdf=vector,
                 table_name=self.table_name,
@@ -309,7 +289,7 @@ class VectorRequest(BaseRequest):
 
         try:
             logger.debug(
-                f"Creating table {self.schema_name}.{self.table_name} in database"
+                "Creating table %s.%s in database", self.schema_name, self.table_name
             )
             vpg.instance_to_table(
                 table_name=self.table_name,
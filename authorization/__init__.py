@@ -1,2 +1,2 @@
 # init for authorization folder vault.py
-from .vault import VaultAuth
\ No newline at end of file
+from .vault import VaultAuth, get_default_credential
\ No newline at end of file
@@ -7,8 +7,30 @@ from azure.identity import (
 )
 from azure.keyvault.secrets import SecretClient
 
+import threading
+
 from utils import logger, VAULT_NAME
 
+_DEFAULT_CREDENTIAL = None
+_DEFAULT_CREDENTIAL_LOCK = threading.Lock()
+
+def get_default_credential():
+    """DefaultAzureCredential shared by every client in the worker, built on first use.
+
+    The credential caches its tokens, so vault, blob and database clients reuse one
+    credential chain probe instead of running it per client.
+    """
+    global _DEFAULT_CREDENTIAL
+    if _DEFAULT_CREDENTIAL is None:
+        with _DEFAULT_CREDENTIAL_LOCK:
+            if _DEFAULT_CREDENTIAL is None:
+                _DEFAULT_CREDENTIAL = DefaultAzureCredential(
+                    exclude_interactive_browser_credential=True,
+                    exclude_visual_studio_code_credential=True,
+                    exclude_shared_token_cache_credential=True,
+                )
+    return _DEFAULT_CREDENTIAL
+
 class VaultAuth:
     def __init__(self, vault_name: str = None, credential=None):
 
@@ -23,7 +45,7 @@ class VaultAuth:
             logger.debug("Using provided credential")
         else:
             try:
-                self.credential = DefaultAzureCredential()
+                self.credential = get_default_credential()
                 logger.debug("Using DefaultAzureCredential")
             except (AzureError, Exception) as e:
                 error_message = (
@@ -171,7 +171,7 @@ class ImageServer(EnterpriseClient):
         cloudstore_id = cloudstore_id if cloudstore_id else DEFAULT_CLOUDSTORE_ID
         desc = desc if desc else f"{service_name} hosted on DDH GeoDev"
         
-        if not self.cloudstore_dict:
+        if not self.cloudstore_dict or raster_name not in self.cloudstore_dict:
             self._get_cloudstore_contents()
 
         if raster_name in self.cloudstore_dict:
@@ -289,7 +289,7 @@ class ImageServer(EnterpriseClient):
             logger.error(error_message)
             raise EnterpriseClientError(error_message)
         
-        if not self.cloudstore_dict:
+        if not self.cloudstore_dict or any(_name not in self.cloudstore_dict for _name in raster_names):
             self._get_cloudstore_contents()
             
         raster_uris = []
@@ -1,11 +1,17 @@
 import json
 import requests
+from requests.adapters import HTTPAdapter
 import os
 import time
 
 from authorization import VaultAuth
 from utils import *
 
+# shared by all clients in the worker so portal/server calls reuse TCP/TLS connections
+_SESSION = requests.Session()
+# keep more idle connections per host than the default 10 for concurrent invocations
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=PORTAL_POOL_MAXSIZE))
+
 
 class EnterpriseClient:
 
@@ -23,6 +29,9 @@ class EnterpriseClient:
     IMAGERY_SERVICES_URL = f"{IMAGERY_URL}/admin/services"
     RASTER_TOOLS_URL = f"{IMAGERY_URL}/rest/services/System/RasterAnalysisTools/GPServer"
 
+    # portal credentials by (vault_name, secret_name) with fetch time, refetched after PORTAL_CREDENTIAL_CACHE_SECONDS
+    _vault_secrets = dict()
+
     def __init__(self):
 
         logger.debug(f"Initializing EnterpriseClient class")
@@ -108,10 +117,10 @@ class EnterpriseClient:
         # Make requests
         try:
             if method.lower() == "get":
-                response = requests.get(url=url, params=params, headers=headers)
+                response = _SESSION.get(url=url, params=params, headers=headers)
 
             elif method.lower() == "post":
-                response = requests.post(url=url, data=params, headers=headers)
+                response = _SESSION.post(url=url, data=params, headers=headers)
                 
             else:
                 raise ValueError(f"Invalid HTTP method: {method}")
@@ -204,10 +213,10 @@ class EnterpriseClient:
                 logger.debug(url)
                 logger.debug(params)
                 logger.debug(headers)
-                response = requests.get(url=url, params=params, headers=headers)
+                response = _SESSION.get(url=url, params=params, headers=headers)
 
             elif method.lower() == "post":
-                response = requests.post(
+                response = _SESSION.post(
                     url=url, data=data, headers=headers, json=params
                 )
             else:
@@ -836,6 +845,11 @@ class EnterpriseClient:
     def _credential_from_vault(self, vault_name: str = None, secret_name=None):
 
         secret_name = secret_name if secret_name else SECRET_PORTAL_ADMIN_CREDENTIAL
+        cached = EnterpriseClient._vault_secrets.get((vault_name, secret_name))
+        if cached and time.monotonic() - cached[1] < PORTAL_CREDENTIAL_CACHE_SECONDS:
+            logger.debug("Using cached portal credential")
+            return cached[0]
+
         auth = VaultAuth(vault_name=vault_name)
         if auth.secret_client:
             try:
@@ -851,6 +865,8 @@ class EnterpriseClient:
 
             secret = auth.secret_client.get_secret(secret_name)
             if secret and secret.value:
+                EnterpriseClient._vault_secrets[(vault_name, secret_name)] = (
+                    secret.value, time.monotonic())
                 return secret.value
             else:
                 raise EnterpriseClientError(
@@ -964,7 +980,7 @@ class EnterpriseClient:
                 "f": "json",
             }
             try:
-                response = requests.post(self.token_url, data=payload)
+                response = _SESSION.post(self.token_url, data=payload)
                 token = response.json()["token"]
                 
                 return token
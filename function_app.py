@@ -53,6 +53,12 @@ def copy(req: func.HttpRequest) -> func.HttpResponse:
     handler = StorageRequest(req,command='copy')
     return handler.response
 
+@app.route(route='copy_status', methods=['GET', 'POST'])
+def copy_status(req: func.HttpRequest) -> func.HttpResponse:
+    logger.info('Copy status function recieved a request')
+    handler = StorageRequest(req,command='copy_status')
+    return handler.response
+
 @app.route(route='list_containers', methods=['GET', 'POST'])
 def list_containers(req: func.HttpRequest) -> func.HttpResponse:
     logger.info('List containers function recieved a request')
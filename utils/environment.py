@@ -38,6 +38,21 @@ DEFAULT_EPSG_CODE = 4326
 DEFAULT_CRS_STRING = f"EPSG:{DEFAULT_EPSG_CODE}"
 DEFAULT_GEOMETRY_NAME = "shape"
 DEFAULT_INSERT_BATCH_SIZE = 1000
+DB_POOL_MAX_CONNECTIONS = 10
+DB_CREDENTIAL_CACHE_SECONDS = 900
+PORTAL_CREDENTIAL_CACHE_SECONDS = 900
+PORTAL_CLIENT_CACHE_SECONDS = 1800
+PUBLISH_RESULT_CACHE_SECONDS = 300
+PUBLISH_INFLIGHT_WAIT_SECONDS = 300
+STAGE_RESULT_CACHE_SECONDS = 300
+COPY_POLL_INITIAL_SECONDS = 0.05
+COPY_POLL_MAX_SECONDS = 5
+CONTAINER_CHECK_CACHE_SECONDS = 600
+UPLOAD_BLOCK_SIZE = 8 * 1024 * 1024
+UPLOAD_MAX_CONCURRENCY = 8
+COPY_MAX_CONCURRENCY = 32
+BLOB_POOL_MAXSIZE = 64
+PORTAL_POOL_MAXSIZE = 16
 
 # Secret names
 SECRET_DB_NAME = "db-name"
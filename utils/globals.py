@@ -70,6 +70,7 @@ GDB_TABLE_NAME_MAX_LENGTH = 30
 # Idempotent Processing
 REQUESTS_TABLE_NAME = "processing_requests"
 OPERATIONS_TABLE_NAME = "processing_operations"
+PUBLISHED_SERVICES_TABLE_NAME = "operation_published_services"
 LOG_TABLE_NAME = "proc_logs"
 LOG_SCHEMA_NAME = "app"
 LOG_COLUMNS = [
@@ -1,8 +1,12 @@
+import atexit
+import contextvars
 import os
 import logging
-from logging.handlers import MemoryHandler
+import queue
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
 
 BUFFER_SIZE = 1
+LOG_LIST_MAX_MESSAGES = 500
 
 class BufferedLogger(logging.Logger):
     def __init__(self, name, level=logging.NOTSET):
@@ -43,16 +47,43 @@ class ColorFormatter(logging.Formatter):
 
         return result
 
+# warning messages of the request running in the current context, see ListHandler.capture
+_request_messages = contextvars.ContextVar("request_log_messages", default=None)
+
 class ListHandler(logging.Handler):
     """Custom logging handler to store log messages in a list."""
-    def __init__(self):
+    def __init__(self, max_messages: int = LOG_LIST_MAX_MESSAGES):
         super().__init__()
+        self.max_messages = max_messages
         self.log_messages = []
 
+    def _append(self, messages: list, message: str):
+        messages.append(message)
+        # trim in bulk so appends stay amortized O(1)
+        if len(messages) > 2 * self.max_messages:
+            del messages[:-self.max_messages]
+
     def emit(self, record):
         # Add log messages with WARNING or higher level to the list
         if record.levelno >= logging.WARNING:
-            self.log_messages.append(self.format(record))
+            message = self.format(record)
+            self._append(self.log_messages, message)
+            request_messages = _request_messages.get()
+            if request_messages is not None:
+                self._append(request_messages, message)
+
+    def capture(self) -> list:
+        """Collect the warnings logged from the current context into a new list and return it.
+
+        Concurrent requests run on separate worker threads, so each gets only its own messages
+        while log_messages keeps the bounded process-wide history.
+        """
+        messages = []
+        _request_messages.set(messages)
+        return messages
+
+    def clear(self):
+        self.log_messages.clear()
 
 try:
     amd64 = 'AMD64' in os.environ['PROCESSOR_ARCHITECTURE']
@@ -72,9 +103,16 @@ formatter = formatter_class(
 console_handler = logging.StreamHandler()
 console_handler.setFormatter(formatter)
 
+# console writes happen on the listener thread so logging calls only enqueue
+log_queue = queue.SimpleQueue()
+queue_handler = QueueHandler(log_queue)
+log_listener = QueueListener(log_queue, console_handler, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
+
 if amd64:
     logger = logging.getLogger("LocalLogger")
-    logger.addHandler(console_handler)
+    logger.addHandler(queue_handler)
 
 else:
     
@@ -82,13 +120,25 @@ else:
     memory_handler = MemoryHandler(
         capacity=BUFFER_SIZE, 
         flushLevel=logging.WARNING,
-        target=console_handler)
+        target=queue_handler)
     
     logger.set_memory_handler(memory_handler)
     
 logger.setLevel(logging.DEBUG)
 logger.propagate = False
 
+def _log_directly_in_child():
+    # forked children (multiprocessing.Pool workers) inherit the queue but not the listener thread,
+    # so records would sit in the queue undrained; write straight to the console instead
+    if queue_handler in logger.handlers:
+        logger.removeHandler(queue_handler)
+        logger.addHandler(console_handler)
+    if getattr(logger, "memory_handler", None) is not None:
+        logger.memory_handler.setTarget(console_handler)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_log_directly_in_child)
+
 
 log_list = ListHandler()
 log_list.setFormatter(logging.Formatter("%(asctime)s %(levelname)s: %(message)s"))
@@ -1,13 +1,28 @@
-from functools import wraps
+from functools import lru_cache, wraps
 
 from geopandas import GeoDataFrame
+from geopandas.array import from_shapely
+from numpy import array as np_array
+from numpy import column_stack, unique
+from pyproj import Transformer
 from shapely import (
     Polygon,
     MultiPolygon,
     LineString,
     MultiLineString,
     Point,
-    MultiPoint
+    MultiPoint,
+    force_2d,
+    get_coordinates,
+    get_type_id,
+    has_z,
+    is_empty,
+    is_missing,
+    is_valid,
+    multilinestrings,
+    multipoints,
+    multipolygons,
+    set_coordinates,
 )
 
 from utils import (
@@ -23,6 +38,22 @@ from utils import (
     VectorHandlerError)
 
 
+@lru_cache(maxsize=32)
+def _get_transformer(from_crs, epsg_code: int) -> Transformer:
+    # Transformer construction is the expensive part of a reprojection
+    return Transformer.from_crs(from_crs, f"EPSG:{epsg_code}", always_xy=True)
+
+
+def _transform_geometries(geoms, from_crs, epsg_code: int):
+    # transforms the flat 2D coordinate array of geoms in a single call
+    transformer = _get_transformer(from_crs, epsg_code)
+    coords = get_coordinates(geoms)
+    logger.debug(f"Transforming {len(coords)} coordinates to EPSG:{epsg_code}")
+    x, y = transformer.transform(coords[:, 0], coords[:, 1])
+    
+    return set_coordinates(geoms, column_stack([x, y]))
+
+
 class VectorHandler:
 
     GEOM_DICT = {
@@ -33,6 +64,22 @@ class VectorHandler:
         "MultiLineString": MultiLineString,
         "MultiPoint": MultiPoint,
     }
+    
+    # shapely.get_type_id codes
+    GEOM_TYPE_IDS = {
+        0: "Point",
+        1: "LineString",
+        3: "Polygon",
+        4: "MultiPoint",
+        5: "MultiLineString",
+        6: "MultiPolygon",
+    }
+    
+    MULTI_CONSTRUCTORS = {
+        "MultiPoint": multipoints,
+        "MultiLineString": multilinestrings,
+        "MultiPolygon": multipolygons,
+    }
 
     def __init__(
         self,
@@ -168,6 +215,8 @@ class VectorHandler:
                 f"GeoDataFrame contains uppercase column names: {column_names} - renaming columns")
             
             try:
+                # shallow copy so the caller's column index is never mutated
+                gdf = gdf.copy(deep=False)
                 gdf.columns = gdf.columns.str.lower()
                 logger.info(f"Info: GeoDataFrame columns renamed to lowercase")
                 
@@ -210,17 +259,20 @@ class VectorHandler:
         
         return gdf
 
-    def uniform_geometry_type(self, gdf: GeoDataFrame) -> str:
+    def uniform_geometry_type(self, gdf: GeoDataFrame = None, geometry_types: list = None) -> str:
         # checks for mixed geometry types and returns the most complex compatible type if valid combination e.g. Polygons and MultiPolygons
 
         geom_type = None
-        try:
-            logger.debug("Reading geometry types from gdf")
-            geometry_types = list(set(gdf.geometry.type))
-        except Exception as e:
-            error_message = f"Error reading geometry types from gdf: {e}"
-            logger.error(error_message)
-            raise VectorHandlerError(error_message)
+        if isinstance(geometry_types, list):
+            logger.debug("Using provided geometry types")
+        else:
+            try:
+                logger.debug("Reading geometry types from gdf")
+                geometry_types = list(set(gdf.geometry.type))
+            except Exception as e:
+                error_message = f"Error reading geometry types from gdf: {e}"
+                logger.error(error_message)
+                raise VectorHandlerError(error_message)
 
         logger.debug(f"Geometry types detected: {geometry_types}")
         
@@ -309,6 +361,8 @@ class VectorHandler:
         if len(geoms) > 1:
             logger.debug(f"Converting geometry types to: {to_geometry_type}")
             try:
+                # shallow copy so the caller's geometry column is never replaced
+                gdf = gdf.copy(deep=False)
                 gdf[geometry_name] = gdf[geometry_name].apply(
                     lambda shape: (
                         self.GEOM_DICT[to_geometry_type]([shape])
@@ -366,6 +420,8 @@ class VectorHandler:
                 f"Geometry column contains z values - geometry type {geometry_type}"
             )
             try:
+                # shallow copy so the caller's geometry column is never replaced
+                gdf = gdf.copy(deep=False)
                 if geometry_type == "Polygon":
                     gdf[geometry_name] = gdf[geometry_name].apply(
                         lambda shape: Polygon(
@@ -488,6 +544,21 @@ class VectorHandler:
 
         return gdf
 
+    def reproject_gdf(self, gdf: GeoDataFrame, epsg_code: int) -> GeoDataFrame:
+        # transforms the flat coordinate array in one call instead of per geometry
+        if any(gdf.geometry.has_z):
+            logger.debug("Geometry column contains z values - using GeoDataFrame.to_crs")
+            
+            return gdf.to_crs(epsg=epsg_code)
+        
+        geoms = np_array(gdf.geometry.values, dtype=object)
+        geoms = _transform_geometries(geoms, gdf.crs, epsg_code)
+        
+        gdf = gdf.copy()
+        gdf[gdf.geometry.name] = from_shapely(geoms, crs=f"EPSG:{epsg_code}")
+        
+        return gdf
+
     def update_gdf_crs(self, gdf: GeoDataFrame, epsg_code: int = None):
 
         if isinstance(epsg_code, int):
@@ -500,17 +571,21 @@ class VectorHandler:
         logger.debug(f"Updating GeoDataFrame CRS to EPSG:{epsg_code}")
         if not gdf.crs:
             logger.warning("GeoDataFrame does not have a CRS set")
-            logger.debug(f"Setting GeoDataFrame CRS to EPSG:{DEFAULT_EPSG_CODE}")
-            gdf = gdf.set_crs(f"EPSG:{epsg_code}")
+            logger.debug(f"Setting GeoDataFrame CRS to EPSG:{epsg_code}")
+            gdf = gdf.set_crs(epsg=epsg_code)
+            logger.info(f"GeoDataFrame CRS set to EPSG:{epsg_code}")
             
-        if gdf.crs.to_string() == f"EPSG:{epsg_code}":
+            return gdf
+        
+        # compare the integer EPSG code instead of formatting the CRS as a string
+        if gdf.crs.to_epsg() == epsg_code:
             logger.info(f"GeoDataFrame is already in EPSG:{epsg_code}")
         else:
             logger.warning(
-                f"GeoDataFrame is in {gdf.crs.to_string()}, reprojecting to EPSG:{epsg_code}"
+                f"GeoDataFrame is in {gdf.crs}, reprojecting to EPSG:{epsg_code}"
             )
             try:
-                gdf = gdf.to_crs(epsg=epsg_code)
+                gdf = self.reproject_gdf(gdf=gdf, epsg_code=epsg_code)
                 logger.info(f"GeoDataFrame reprojected to EPSG:{epsg_code}")
 
             except Exception as e:
@@ -520,6 +595,64 @@ class VectorHandler:
         return gdf
 
 
+    def prepare_geometry(self, gdf: GeoDataFrame, epsg_code: int = None):
+        # single pass equivalent of remove_nulls_from_gdf, set_uniform_geometry_type,
+        # remove_gdf_z_values and update_gdf_crs - returns (gdf, geometry_type)
+        epsg_code = epsg_code if isinstance(epsg_code, int) else self.epsg_code
+        geometry_name = gdf.geometry.name
+        crs = gdf.crs
+        geoms = np_array(gdf.geometry.values, dtype=object)
+        gdf_length = len(geoms)
+        
+        logger.debug("Removing null, invalid and empty geometries")
+        keep = ~is_missing(geoms) & is_valid(geoms) & ~is_empty(geoms)
+        dropped_count = gdf_length - int(keep.sum())
+        if dropped_count > 0:
+            logger.warning(f"Total invalid geometries removed: {dropped_count} out of {gdf_length}")
+            if dropped_count == gdf_length:
+                logger.critical(
+                    f"All geometries removed from GeoDataFrame: {dropped_count} invalid geometries"
+                )
+                raise ValueError(
+                    f"GeoDataFrame is empty after removing invalid geometries: {dropped_count} invalid geometries"
+                )
+            gdf = gdf[keep]
+            geoms = geoms[keep]
+        else:
+            logger.info(f"GeoDataFrame has {gdf_length} valid geometries")
+        
+        type_ids = get_type_id(geoms)
+        geometry_types = [
+            self.GEOM_TYPE_IDS.get(int(type_id), f"type_id {type_id}")
+            for type_id in unique(type_ids)
+        ]
+        geometry_type = self.uniform_geometry_type(geometry_types=geometry_types)
+        if len(geometry_types) > 1:
+            logger.debug(f"Converting geometry types to: {geometry_type}")
+            type_id = {name: _id for _id, name in self.GEOM_TYPE_IDS.items()}[geometry_type]
+            single = type_ids != type_id
+            geoms[single] = self.MULTI_CONSTRUCTORS[geometry_type](geoms[single].reshape(-1, 1))
+            logger.info(f"Geometry type set to {geometry_type}")
+        
+        if has_z(geoms).any():
+            logger.warning(f"Geometry column contains z values - geometry type {geometry_type}")
+            geoms = force_2d(geoms)
+            logger.info("Z values removed from geometry column")
+        
+        if not crs:
+            logger.warning(f"GeoDataFrame does not have a CRS set - setting EPSG:{epsg_code}")
+        elif crs.to_epsg() == epsg_code:
+            logger.info(f"GeoDataFrame is already in EPSG:{epsg_code}")
+        else:
+            logger.warning(f"GeoDataFrame is in {crs}, reprojecting to EPSG:{epsg_code}")
+            geoms = _transform_geometries(geoms, crs, epsg_code)
+            logger.info(f"GeoDataFrame reprojected to EPSG:{epsg_code}")
+        
+        gdf = gdf.copy()
+        gdf[geometry_name] = from_shapely(geoms, crs=f"EPSG:{epsg_code}")
+        
+        return gdf, geometry_type
+
     # Single function runs
 
     def prepare_gdf(
@@ -580,43 +713,13 @@ class VectorHandler:
             logger.error("Error validating column data types")
             raise
         
-        # Geometry
-        try:
-            logger.debug("Removing null and invalid geometries")
-            gdf = self.remove_nulls_from_gdf(gdf=gdf)
-            logger.info("Invalid geometry validation completed")
-        except Exception as e:
-            logger.error(f"Error removing null geometries: {e}")
-            raise
-        try:
-            logger.debug("Determining geometry type for GeoDataFrame")
-            geometry_type = self.uniform_geometry_type(gdf=gdf)
-            logger.info(f"Geometry type found: {geometry_type}")
-        except Exception as e:
-            logger.error(f"Error determining geometry type: {e}")
-            raise
-        try:
-            logger.debug("Validating uniform geometry type")
-            gdf = self.set_uniform_geometry_type(gdf=gdf)
-            logger.info(f"Geometry type set to {geometry_type}")
-        except Exception as e:
-            logger.error(f"Error converting geometry types: {e}")
-            raise
-        try:
-            logger.debug("Removing z values from geometry column")
-            gdf = self.remove_gdf_z_values(gdf=gdf, geometry_name=geometry_name)
-            logger.info("Z value validation completed")
-        except Exception as e:
-            logger.error(f"Error removing z values from geometry column: {e}")
-            raise
-
-        # CRS
+        # Geometry and CRS
         try:
-            logger.debug(f"Updating CRS to EPSG:{epsg_code}")
-            gdf = self.update_gdf_crs(gdf=gdf, epsg_code=epsg_code)
-            logger.info(f"GeoDataFrame CRS updated to EPSG:{epsg_code}")
+            logger.debug(f"Validating geometries and updating CRS to EPSG:{epsg_code}")
+            gdf, geometry_type = self.prepare_geometry(gdf=gdf, epsg_code=epsg_code)
+            logger.info(f"Geometry type {geometry_type} validated in EPSG:{epsg_code}")
         except Exception as e:
-            logger.error(f"Error updating CRS to EPSG:{epsg_code} {e}")
+            logger.error(f"Error preparing geometry column: {e}")
             raise
 
         logger.info(f"GeoDataFrame prepared for database upload")
@@ -653,7 +756,9 @@ class VectorHandler:
                 epsg_code=epsg_code,
                 column_dict=column_dict,
             )
-        instance.gdf = gdf.copy()
+        # prepare_gdf replaces the frame with a new one; an unvalidated frame is copied
+        # so later changes to instance.gdf never reach the caller's GeoDataFrame
+        instance.gdf = gdf if validate else gdf.copy()
         
         if validate:
             try:
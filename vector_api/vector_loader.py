@@ -14,6 +14,14 @@ from pandas import read_csv as pd_read_csv
 from shapely import Point, wkt
 from shapely.errors import WKTReadingError, ShapelyError
 
+try:
+    import pyarrow
+    # pyarrow parses multithreaded; columns stay numpy dtypes so the SQL type mapping and
+    # dtype validation see the same types as the default reader
+    CSV_READ_KWARGS = {"engine": "pyarrow"}
+except ImportError:
+    CSV_READ_KWARGS = dict()
+
 from api_clients import StorageHandler
 
 from utils import (
@@ -449,7 +457,14 @@ class VectorLoader:
             logger.debug(f"Reading csv file {vector_file_name} from blob storage")
             bytes_data = self.storage.blob_to_bytesio(vector_file_name)
             logger.info(f"Bytes data created from csv file {vector_file_name}")
-            df = pd_read_csv(bytes_data)
+            try:
+                df = pd_read_csv(bytes_data, **CSV_READ_KWARGS)
+            except Exception as e:
+                if not CSV_READ_KWARGS:
+                    raise
+                logger.warning(f"pyarrow csv read failed for {vector_file_name}, falling back to default reader: {e}")
+                bytes_data.seek(0)
+                df = pd_read_csv(bytes_data)
             logger.info(f"DataFrame created from csv file {vector_file_name} with {len(df)} rows")
             
         except Exception as e:
@@ -1,13 +1,16 @@
 
-from functools import wraps
+from functools import partial, wraps
 from math import ceil
 import os
 from multiprocessing import Pool, current_process
-import numpy as np
 
 from geopandas import GeoDataFrame
 from psycopg2 import sql
+from psycopg2.extras import execute_values
 from pyproj import CRS
+from shapely import to_wkt
+from sqlalchemy import create_engine
+from sqlalchemy.engine import URL
 
 from api_clients import DatabaseClient
 from vector_api import VectorHandler
@@ -19,6 +22,7 @@ from utils import (
     ENTERPRISE_GEODATABASE_DB,
     DEFAULT_DB_USER,
     DEFAULT_EPSG_CODE,
+    DEFAULT_INSERT_BATCH_SIZE,
     DATABASE_ALLOWED_CHARACTERS,
     DATABASE_RESERVED_WORDS,
     GDF_VALID_DATATYPES,
@@ -26,8 +30,36 @@ from utils import (
     
 )
 
+def _execute_insert(query, template, cursor, rows, page_size=None):
+    # executes a prepared insert statement for a list of row tuples
+    execute_values(
+        cursor,
+        query,
+        rows,
+        template=template,
+        page_size=page_size if page_size else DEFAULT_INSERT_BATCH_SIZE)
+
+def _make_inserter(columns, geometry_name, schema_name, table_name, epsg_code):
+    # composes the insert statement for a table once and returns a callable
+    # inserter(cursor, rows) that reuses it for every batch
+    query = sql.SQL(
+        "INSERT INTO {schema}.{table} ({fields}) VALUES %s"
+    ).format(
+        schema=sql.Identifier(schema_name),
+        table=sql.Identifier(table_name),
+        fields=sql.SQL(", ").join(sql.Identifier(col) for col in columns),
+    )
+    template = "({})".format(", ".join(
+        f"ST_GeomFromText(%s, {int(epsg_code)})" if col == geometry_name else "%s"
+        for col in columns))
+    
+    return partial(_execute_insert, query, template)
+
 class EnterprisePostGIS(DatabaseClient):
     
+    # SQLAlchemy engines keyed by connection parameters and credential fingerprint, shared across instances
+    _engines = dict()
+    
     def __init__(
 
         self,
@@ -57,6 +89,9 @@ class EnterprisePostGIS(DatabaseClient):
         self.geometry_type = geometry_type
         self.table_name = table_name
         self.valid_gdf = False
+        
+        self._inserter = None
+        self._inserter_key = None
     
     @staticmethod
     def valid_geometry(func):
@@ -244,22 +279,13 @@ class EnterprisePostGIS(DatabaseClient):
         logger.debug("Creating table query")
 
         create_table_query = sql.SQL(
-            "CREATE TABLE IF NOT EXISTS {schema}.{table} ({columns})"
+            "CREATE TABLE IF NOT EXISTS {schema}.{table} ({columns});"
         ).format(
             table=sql.Identifier(table_name),
             schema=sql.Identifier(schema_name),
             columns=sql.SQL(", ".join(columns)),
         )
         
-        try:
-            logger.debug(f"Creating table {table_name} with columns: {columns}")
-            self.query(create_table_query)
-            logger.info(f"Table {table_name} created successfully.")
-        except Exception as e:
-            logger.error(f"Error creating table {table_name}: {e}")
-            logger.error(f"invalid query: {create_table_query}")
-            raise
-        
         gist_name = f"{table_name}_gist"
         create_gist_query = sql.SQL(
                 """
@@ -271,13 +297,6 @@ class EnterprisePostGIS(DatabaseClient):
                 geometry=sql.Identifier(geometry_name),
                 schema=sql.Identifier(schema_name)
             )
-        try:
-            logger.debug(f"Creating geometry index on table {table_name}")
-            self.query(create_gist_query)
-            logger.info(f"Geometry index created successfully for table {table_name}")
-        except Exception as e:
-            logger.error(f"Error creating geometry index for table {table_name}: {e}")
-            raise
             
         uidx_name = f"{table_name}_idx"
         create_oid_index_query = sql.SQL(
@@ -290,34 +309,46 @@ class EnterprisePostGIS(DatabaseClient):
                 schema=sql.Identifier(schema_name),
                 column_name = sql.Identifier("objectid")
             )
-        try:
-            logger.debug(f"Creating objectid index table {table_name}")
-            self.query(create_oid_index_query)
-            logger.info(f"ObjectID created successfully for table {table_name}")
-        except Exception as e:
-            logger.error(f"Error creating ObjectID index for table {table_name}: {e}")
-            raise
         
-        if timestamp_uidx_name:
-            tidx_name = f"{timestamp_uidx_name}_tidx"
-            logger.debug("Creating timestamp index")
-            create_tidx_query = sql.SQL(
-                """
-                CREATE UNIQUE INDEX {index_name} ON {schema}.{table} USING btree ({timestamp_index}) WITH (fillfactor='75');
-                """
-            ).format(
-                index_name=sql.Identifier(tidx_name),
-                table=sql.Identifier(table_name),
-                schema=sql.Identifier(schema_name),
-                timestamp_index=sql.Identifier(timestamp_uidx_name),
-            )
-
-            try:
-                logger.debug(f"Creating timestamp index {timestamp_uidx_name} for table {table_name}")
-                self.query(create_tidx_query)
-                logger.info(f"Timestamp index created successfully for table {table_name}")
-            except Exception as e:
-                logger.error(f"Error timestamp index {timestamp_uidx_name} for table {table_name}: {e}")
+        # Table, geometry index and objectid index are created in one transaction
+        create_query = sql.Composed(
+            [create_table_query, create_gist_query, create_oid_index_query])
+        
+        with self.connect() as conn:
+            with conn.cursor() as cursor:
+                try:
+                    logger.debug(f"Creating table {table_name} with columns: {columns} and indexes {gist_name}, {uidx_name}")
+                    cursor.execute(create_query)
+                    conn.commit()
+                    logger.info(f"Table {table_name} created successfully with geometry and ObjectID indexes")
+                except Exception as e:
+                    conn.rollback()
+                    logger.error(f"Error creating table {table_name}: {e}")
+                    logger.error(f"invalid query: {create_query}")
+                    raise
+        
+                if timestamp_uidx_name:
+                    tidx_name = f"{timestamp_uidx_name}_tidx"
+                    logger.debug("Creating timestamp index")
+                    create_tidx_query = sql.SQL(
+                        """
+                        CREATE UNIQUE INDEX {index_name} ON {schema}.{table} USING btree ({timestamp_index}) WITH (fillfactor='75');
+                        """
+                    ).format(
+                        index_name=sql.Identifier(tidx_name),
+                        table=sql.Identifier(table_name),
+                        schema=sql.Identifier(schema_name),
+                        timestamp_index=sql.Identifier(timestamp_uidx_name),
+                    )
+
+                    try:
+                        logger.debug(f"Creating timestamp index {timestamp_uidx_name} for table {table_name}")
+                        cursor.execute(create_tidx_query)
+                        conn.commit()
+                        logger.info(f"Timestamp index created successfully for table {table_name}")
+                    except Exception as e:
+                        conn.rollback()
+                        logger.error(f"Error timestamp index {timestamp_uidx_name} for table {table_name}: {e}")
                 
 
         return table_name
@@ -342,39 +373,66 @@ class EnterprisePostGIS(DatabaseClient):
         if not isinstance(gdf, GeoDataFrame):
             raise ValueError("No GeoDataFrame provided")
             
-        the_matrix = None
         try:
-            the_matrix = gdf.values.tolist()
-            batch_length = len(the_matrix)
+            inserter = self.get_inserter(
+                columns=list(gdf.columns),
+                geometry_name=geometry_name,
+                schema_name=schema_name,
+                table_name=table_name)
         except Exception as e:
-            logger.error(f"Error converting GeoDataFrame to matrix: {e}")
+            logger.error(f"Error building insert statement: {e}")
             raise
         
-        if current_proc and batch_name:
-            logger.debug(f"Process {current_proc} initiated - inserting data into table {table_name} batch #{batch_name} with {batch_length} rows")
-        
         try:
-            exp, values = self.build_insert_statement(
-                table_name=table_name,
-                schema_name=schema_name,
-                column_names=[col for col in gdf.columns],
-                matrix=the_matrix,
-                geometry_name=geometry_name)
+            # values are converted column by column; geometries are written to WKT in one vectorized call
+            column_values = [
+                to_wkt(gdf[col].values, rounding_precision=-1).tolist()
+                if col == geometry_name
+                else [self.to_insert_value_type(value) for value in gdf[col].tolist()]
+                for col in gdf.columns
+            ]
+            rows = list(zip(*column_values))
+            del column_values
+            batch_length = len(rows)
         except Exception as e:
-            logger.error(f"Error building insert statement: {e}")
+            logger.error(f"Error converting GeoDataFrame to matrix: {e}")
             raise
         
+        if current_proc and batch_name:
+            logger.debug(f"Process {current_proc} initiated - inserting data into table {table_name} batch #{batch_name} with {batch_length} rows")
+        
         try:
             logger.debug(f"Inserting {batch_length} rows into {schema_name}.{table_name}")
-            executed = self.query(exp, values)
-            if executed:
-                logger.info(f"{batch_length} rows inserted into {table_name} successfully.")
-            else:
-                raise VectorHandlerError(f"Unknown error inserting data into table {table_name}")
+            with self.connect() as conn:
+                with conn.cursor() as cursor:
+                    inserter(cursor, rows, page_size=batch_length)
+                conn.commit()
+            del rows
+            logger.info(f"{batch_length} rows inserted into {table_name} successfully.")
         except Exception as e:
             logger.error(f"Error inserting data into table: {e}")
             raise
         
+    def get_inserter(
+        self,
+        columns: list,
+        geometry_name: str,
+        schema_name: str,
+        table_name: str):
+        # returns the insert callable for the table, composing it only when the table or columns change
+        inserter_key = (schema_name, table_name, geometry_name, tuple(columns))
+        if self._inserter is None or self._inserter_key != inserter_key:
+            logger.debug(f"Building insert statement for {schema_name}.{table_name}")
+            self._inserter = _make_inserter(
+                columns=columns,
+                geometry_name=geometry_name,
+                schema_name=schema_name,
+                table_name=table_name,
+                epsg_code=self.epsg_code)
+            self._inserter_key = inserter_key
+            
+        return self._inserter
+
     @valid_geometry
     def insert_whole_gdf(
             self, 
@@ -403,14 +461,12 @@ class EnterprisePostGIS(DatabaseClient):
         batch_count = ceil(gdf_length / batch_size)
         cpu_count = os.cpu_count()
         
-        # Split GeoDataFrame into batches
-        try:                
-            logger.debug(f"Splitting GeoDataFrame into {batch_count} batches with {batch_size} rows each")
-            chunks = np.array_split(gdf, batch_count)
-            batches = list(zip(range(1, batch_count+1), chunks))
-        except Exception as e:
-            logger.error(f"Error splitting GeoDataFrame into batches: {e}")
-            raise
+        # Batches are sliced lazily so only one batch of rows is materialized at a time
+        logger.debug(f"Splitting GeoDataFrame into {batch_count} batches with {batch_size} rows each")
+        batches = (
+            (batch_number, gdf.iloc[start:start + batch_size])
+            for batch_number, start in enumerate(range(0, gdf_length, batch_size), start=1)
+        )
         
         logger.info(f"Inserting data from GeoDataFrame with {gdf_length} rows into {table_name} using {cpu_count} processes in {batch_count} batches of {batch_size} rows each")
         
@@ -440,19 +496,18 @@ class EnterprisePostGIS(DatabaseClient):
             
         else:# Sequential batch insert
             logger.debug(f"Inserting {batch_count} into table using sequential batch insert")
-            b = 1
-            for batch in batches:
+            for b, chunk in batches:
                 try:
                     logger.debug(f"Inserting data into table using batch insert - batch {b} of {batch_count}")
                     
                     self.insert_gdf_as_batch(
                         table_name=table_name,
                         schema_name=schema_name,
-                        gdf=batch[1],
+                        gdf=chunk,
                         geometry_name=geometry_name)
+                    del chunk
                     
                     logger.info(f"Batch {b} of {batch_count} inserted successfully")
-                    b+=1
                     
                 except Exception as e:
                     error_message = f"Error inserting batch {b} of {batch_count} of  data into table: {e}"
@@ -463,6 +518,76 @@ class EnterprisePostGIS(DatabaseClient):
             
             return True
 
+    def sqlalchemy_engine(self):
+        # returns a cached SQLAlchemy engine for the instance connection parameters
+        if not self.db_credential:
+            raise VectorHandlerError("Database credential not initialized")
+        
+        # the credential fingerprint is part of the key so a rotated credential gets a new engine
+        params = (self.db_host, self.db_port, self.db_name, self.db_user)
+        engine_key = params + (self.credential_fingerprint(),)
+        engine = EnterprisePostGIS._engines.get(engine_key)
+        
+        if engine is None:
+            for stale_key in [k for k in EnterprisePostGIS._engines if k[:-1] == params]:
+                logger.debug(f"Disposing SQLAlchemy engine for replaced credential {self.db_host}/{self.db_name}")
+                EnterprisePostGIS._engines.pop(stale_key).dispose()
+            logger.debug(f"Creating SQLAlchemy engine for {self.db_host}/{self.db_name}")
+            engine_url = URL.create(
+                drivername="postgresql+psycopg2",
+                username=self.db_user,
+                password=self.db_credential,
+                host=self.db_host,
+                port=self.db_port,
+                database=self.db_name,
+            )
+            engine = create_engine(engine_url, executemany_mode="values_plus_batch")
+            EnterprisePostGIS._engines[engine_key] = engine
+            logger.info(f"SQLAlchemy engine created for {self.db_host}/{self.db_name}")
+            
+        return engine
+
+    @valid_geometry
+    def insert_gdf_postgis(
+            self,
+            gdf: GeoDataFrame,
+            table_name: str,
+            schema_name: str,
+            batch_size: int = None,
+        ):
+        # Appends GeoDataFrame rows to an existing table with GeoDataFrame.to_postgis
+        # geometries are written as WKB and rows are loaded with COPY in chunks of batch_size
+        
+        if gdf.empty:
+            error_message = "GeoDataFrame is empty. No data to insert."
+            logger.error(error_message)
+            raise VectorHandlerError(error_message)
+        
+        batch_size = batch_size if batch_size else DEFAULT_INSERT_BATCH_SIZE
+        
+        try:
+            engine = self.sqlalchemy_engine()
+        except Exception as e:
+            logger.error(f"Error creating SQLAlchemy engine: {e}")
+            raise
+        
+        try:
+            logger.debug(f"Writing {len(gdf)} rows to {schema_name}.{table_name} in chunks of {batch_size}")
+            gdf.to_postgis(
+                name=table_name,
+                con=engine,
+                schema=schema_name,
+                if_exists="append",
+                index=False,
+                chunksize=batch_size,
+            )
+            logger.info(f"{len(gdf)} rows inserted into {schema_name}.{table_name} successfully")
+        except Exception as e:
+            logger.error(f"Error writing GeoDataFrame to {schema_name}.{table_name}: {e}")
+            raise
+        
+        return True
+
     def column_sql_dict_from_gdf(self, gdf: GeoDataFrame, inplace=True) -> dict:
         # returns a dictionary of column names and their sql data types as strings
         #
@@ -553,14 +678,22 @@ class EnterprisePostGIS(DatabaseClient):
         try:
             logger.debug(f"instance_to_table: Inserting data into table {table_name}")
             
-            self.insert_whole_gdf(
-                gdf=self.gdf,
-                table_name=table_name,
-                schema_name=schema_name,
-                geometry_name=geometry_name,
-                batch_size=batch_size,
-                multiproc=multiproc,
-            )
+            if multiproc:
+                self.insert_whole_gdf(
+                    gdf=self.gdf,
+                    table_name=table_name,
+                    schema_name=schema_name,
+                    geometry_name=geometry_name,
+                    batch_size=batch_size,
+                    multiproc=multiproc,
+                )
+            else:
+                self.insert_gdf_postgis(
+                    gdf=self.gdf,
+                    table_name=table_name,
+                    schema_name=schema_name,
+                    batch_size=batch_size,
+                )
             
             logger.info(f"Instance GDF data inserted into {table_name}") 
         except Exception as e:
@@ -601,7 +734,8 @@ class EnterprisePostGIS(DatabaseClient):
                 raise
         elif isinstance(gdf, VectorHandler):
             if getattr(gdf,'valid_gdf'):
-                instance.gdf = gdf.gdf.copy()
+                # valid_gdf is only set by prepare_gdf, whose output is a new frame the caller never held
+                instance.gdf = gdf.gdf
                 instance.valid_gdf = True
             else:
                 raise ValueError("VectorHandler GeoDataFrame is not valid")